@@ -1,5 +1,6 @@
 """WebAuthn approval server for vault_set operations."""
 
+import heapq
 import json
 import os
 import secrets as secrets_module
@@ -8,7 +9,7 @@ import threading
 from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request
@@ -28,6 +29,9 @@ from webauthn.helpers.structs import (
     UserVerificationRequirement,
 )
 
+# Pending operations expire this many seconds after creation
+_PENDING_OP_TTL = 300
+
 
 @dataclass
 class PendingOperation:
@@ -62,6 +66,12 @@ class ApprovalServer:
         self.origin = origin  # Expected origin for WebAuthn
         self.app = FastAPI()
         self.pending_ops: Dict[str, PendingOperation] = {}
+        # Min-heap of (expiry timestamp, op_id); entries for operations that
+        # already left pending_ops are discarded when popped. Both the MCP
+        # thread and the uvicorn thread expire operations, so the heap is only
+        # touched under _expiry_lock.
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._expiry_lock = threading.Lock()
         self.completed_ops: Dict[str, PendingOperation] = {}  # History
         self.credentials_db: Dict[str, dict] = {}  # user_id -> credential
         self.challenges: Dict[str, bytes] = {}  # session_id -> challenge
@@ -107,19 +117,41 @@ class ApprovalServer:
                 data = json.loads(self.pending_ops_file.read_text())
                 # Convert dict to PendingOperation objects
                 for op_id, op_data in data.items():
-                    self.pending_ops[op_id] = PendingOperation(**op_data)
+                    op = PendingOperation(**op_data)
+                    if op_id not in self.pending_ops:
+                        self._track_expiry(op_id, op)
+                    self.pending_ops[op_id] = op
                 # Clean up expired operations (older than 5 minutes)
-                now = datetime.now().timestamp()
-                expired = [
-                    op_id for op_id, op in self.pending_ops.items() if now - op.created_at > 300
-                ]
-                for op_id in expired:
-                    del self.pending_ops[op_id]
-                if expired:
+                if self._expire_pending_operations():
                     self._save_pending_operations()
             except Exception as e:
                 print(f"Warning: Could not load pending operations: {e}", file=sys.stderr)
 
+    def _track_expiry(self, op_id: str, op: PendingOperation):
+        """Schedule a pending operation for expiry."""
+        with self._expiry_lock:
+            heapq.heappush(self._expiry_heap, (op.created_at + _PENDING_OP_TTL, op_id))
+
+    def _expire_pending_operations(self) -> bool:
+        """
+        Drop pending operations whose TTL has passed, soonest expiry first.
+
+        Only expired heap entries are popped, so the cost is proportional to
+        the number of operations expiring rather than the number pending.
+
+        Returns:
+            True if any pending operation was removed
+        """
+        now = datetime.now().timestamp()
+        heap = self._expiry_heap
+        removed = False
+        with self._expiry_lock:
+            while heap and heap[0][0] < now:
+                _, op_id = heapq.heappop(heap)
+                if self.pending_ops.pop(op_id, None) is not None:
+                    removed = True
+        return removed
+
     def _save_pending_operations(self):
         """Save pending operations to disk."""
         try:
@@ -848,7 +880,7 @@ class ApprovalServer:
             op = self.pending_ops[op_id]
 
             # Check expiry (5 minutes)
-            if datetime.now().timestamp() - op.created_at > 300:
+            if datetime.now().timestamp() - op.created_at > _PENDING_OP_TTL:
                 del self.pending_ops[op_id]
                 raise HTTPException(410, "Operation expired (max 5 minutes)")
 
@@ -2148,6 +2180,7 @@ class ApprovalServer:
         tokens_map: Dict[str, str] = None,
     ) -> tuple[str, str]:
         """Create a pending operation and return (operation ID, approval URL)."""
+        self._expire_pending_operations()
         op_id = secrets_module.token_urlsafe(16)
 
         self.pending_ops[op_id] = PendingOperation(
@@ -2159,6 +2192,7 @@ class ApprovalServer:
             created_at=datetime.now().timestamp(),
             tokens_map=tokens_map,  # Store token mapping for display
         )
+        self._track_expiry(op_id, self.pending_ops[op_id])
 
         # Save to disk for cross-process sharing
         self._save_pending_operations()
@@ -2195,6 +2229,7 @@ class ApprovalServer:
         Returns:
             Operation ID
         """
+        self._expire_pending_operations()
         op_id = secrets_module.token_urlsafe(16)
 
         # Secrets are expected to already be detokenized by the calling tool
@@ -2210,6 +2245,7 @@ class ApprovalServer:
             metadata=metadata,
             tokens_map=tokens_map,
         )
+        self._track_expiry(op_id, self.pending_ops[op_id])
 
         # Save to disk for cross-process sharing
         self._save_pending_operations()
@@ -2239,7 +2275,7 @@ class ApprovalServer:
         op = self.pending_ops[op_id]
 
         # Check expiry
-        if datetime.now().timestamp() - op.created_at > 300:  # 5 minutes
+        if datetime.now().timestamp() - op.created_at > _PENDING_OP_TTL:
             del self.pending_ops[op_id]
             return False
 
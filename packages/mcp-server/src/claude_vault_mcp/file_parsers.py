@@ -6,10 +6,82 @@ from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import IO, Dict, Iterator, List, Optional, Tuple
 
 import yaml
 
+# KEY=VALUE line (optional export prefix) and unquoted inline comment
+_ENV_ASSIGNMENT_RE = re.compile(r"^(?:export\s+)?([A-Za-z_][A-Za-z0-9_]*)=(.*)$")
+_INLINE_COMMENT_RE = re.compile(r"^([^#]*?)\s*#")
+
+# Values shorter than this are never treated as secrets
+MIN_SECRET_LENGTH = 8
+
+# Common configuration keys that never hold secrets
+_NON_SECRET_KEYS = frozenset(
+    {
+        "PORT",
+        "PORTS",
+        "HOST",
+        "HOSTNAME",
+        "DOMAIN",
+        "URL",
+        "ENVIRONMENT",
+        "ENV",
+        "NODE_ENV",
+        "DEBUG",
+        "LOG_LEVEL",
+        "LOGLEVEL",
+        "TIMEZONE",
+        "TZ",
+        "PUID",
+        "PGID",
+        "UMASK",
+        "LANG",
+        "LANGUAGE",
+        "LC_ALL",
+        "PATH",
+        "HOME",
+        "USER",
+        "UID",
+        "GID",
+        "WORKDIR",
+        "VERSION",
+    }
+)
+
+# Boolean/simple flag values
+_BOOLEAN_VALUES = frozenset(
+    {"true", "false", "yes", "no", "1", "0", "enabled", "disabled", "on", "off"}
+)
+
+# Key substrings that strongly indicate a secret
+_SECRET_KEY_PATTERNS = (
+    "PASSWORD",
+    "PASSWD",
+    "PWD",
+    "SECRET",
+    "TOKEN",
+    "API_KEY",
+    "APIKEY",
+    "API",
+    "KEY",
+    "PRIVATE_KEY",
+    "PRIV_KEY",
+    "AUTH",
+    "CREDENTIAL",
+    "CREDS",
+    "SALT",
+    "HASH",
+    "ENCRYPTION_KEY",
+    "ENCRYPT",
+    "SIGNATURE",
+    "CERT",
+    "CERTIFICATE",
+    "LICENSE",
+    "SESSION",
+)
+
 
 @dataclass
 class EnvLine:
@@ -22,52 +94,51 @@ class EnvLine:
     comment: Optional[str] = None  # Inline comment after value
 
 
-def parse_env_file(file_path: str) -> Dict[str, str]:
+def _iter_lines(f: IO[str]) -> Iterator[str]:
+    """Yield lines without their newline, matching ``content.split("\\n")``."""
+    ended_with_newline = True
+    for line in f:
+        ended_with_newline = line.endswith("\n")
+        yield line[:-1] if ended_with_newline else line
+    if ended_with_newline:
+        yield ""
+
+
+def parse_env_file_stream(file_path: str) -> Iterator[Tuple[str, str]]:
     """
-    Parse .env file into key-value pairs.
+    Parse .env file lazily, yielding key-value pairs in file order.
 
-    Handles:
-    - Comments (# prefix)
-    - Quoted values ("..." or '...')
-    - Multiline values (with quotes)
-    - Blank lines
-    - export prefix (export KEY=value)
+    The file is read line by line through a buffered reader, so memory use
+    does not grow with file size. Undecodable bytes are replaced rather than
+    raising. Keys assigned more than once are yielded once per assignment.
 
     Args:
         file_path: Path to .env file
 
-    Returns:
-        Dict of key-value pairs
+    Yields:
+        (key, value) tuples
 
     Raises:
         FileNotFoundError: If file doesn't exist
-        ValueError: If file cannot be parsed
     """
     if not Path(file_path).exists():
         raise FileNotFoundError(f"File not found: {file_path}")
 
-    result = {}
-    path = Path(file_path)
+    with open(file_path, "r", encoding="utf-8", errors="replace", buffering=65536) as f:
+        lines = _iter_lines(f)
 
-    with open(path, "r", encoding="utf-8") as f:
-        content = f.read()
+        for raw_line in lines:
+            line = raw_line.rstrip()
 
-    # Parse line by line
-    lines = content.split("\n")
-    i = 0
+            # Skip blank lines and comments
+            if not line or line.strip().startswith("#"):
+                continue
 
-    while i < len(lines):
-        line = lines[i].rstrip()
+            # Match KEY=VALUE pattern (with optional export prefix)
+            match = _ENV_ASSIGNMENT_RE.match(line)
+            if not match:
+                continue
 
-        # Skip blank lines and comments
-        if not line or line.strip().startswith("#"):
-            i += 1
-            continue
-
-        # Match KEY=VALUE pattern (with optional export prefix)
-        match = re.match(r"^(?:export\s+)?([A-Za-z_][A-Za-z0-9_]*)=(.*)$", line)
-
-        if match:
             key = match.group(1)
             value = match.group(2)
 
@@ -82,10 +153,8 @@ def parse_env_file(file_path: str) -> Dict[str, str]:
                 else:
                     # Multiline value - collect until closing quote
                     multiline_value = value[1:]  # Remove opening quote
-                    i += 1
 
-                    while i < len(lines):
-                        next_line = lines[i]
+                    for next_line in lines:
                         multiline_value += "\n" + next_line
 
                         if next_line.rstrip().endswith(quote_char):
@@ -93,22 +162,40 @@ def parse_env_file(file_path: str) -> Dict[str, str]:
                             multiline_value = multiline_value[:-1]
                             break
 
-                        i += 1
-
                     value = multiline_value
             else:
                 # Unquoted value - strip inline comments
-                comment_match = re.match(r"^([^#]*?)\s*#", value)
+                comment_match = _INLINE_COMMENT_RE.match(value)
                 if comment_match:
                     value = comment_match.group(1).strip()
                 else:
                     value = value.strip()
 
-            result[key] = value
+            yield key, value
 
-        i += 1
 
-    return result
+def parse_env_file(file_path: str) -> Dict[str, str]:
+    """
+    Parse .env file into key-value pairs.
+
+    Handles:
+    - Comments (# prefix)
+    - Quoted values ("..." or '...')
+    - Multiline values (with quotes)
+    - Blank lines
+    - export prefix (export KEY=value)
+
+    Args:
+        file_path: Path to .env file
+
+    Returns:
+        Dict of key-value pairs (the last assignment of a key wins)
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If file cannot be parsed
+    """
+    return dict(parse_env_file_stream(file_path))
 
 
 def parse_env_file_with_structure(file_path: str) -> List[EnvLine]:
@@ -381,6 +468,24 @@ def write_docker_compose(file_path: str, data: Dict) -> None:
         )
 
 
+def may_be_secret(key: str, value: str) -> bool:
+    """
+    Cheap pre-check to run before classify_secret.
+
+    A False result guarantees classify_secret would also return False, so
+    obvious config values (empty, non-string or short) skip the full
+    heuristics. A True result is not a verdict; call classify_secret.
+
+    Args:
+        key: Environment variable key
+        value: Environment variable value
+
+    Returns:
+        False if the value certainly is not a secret, True otherwise
+    """
+    return isinstance(value, str) and len(value) >= MIN_SECRET_LENGTH
+
+
 def classify_secret(key: str, value: str) -> bool:
     """
     Determine if a key-value pair is likely a secret.
@@ -403,37 +508,7 @@ def classify_secret(key: str, value: str) -> bool:
     value_lower = value.lower()
 
     # 1. Non-secret key patterns (common configuration keys)
-    NON_SECRET_KEYS = {
-        "PORT",
-        "PORTS",
-        "HOST",
-        "HOSTNAME",
-        "DOMAIN",
-        "URL",
-        "ENVIRONMENT",
-        "ENV",
-        "NODE_ENV",
-        "DEBUG",
-        "LOG_LEVEL",
-        "LOGLEVEL",
-        "TIMEZONE",
-        "TZ",
-        "PUID",
-        "PGID",
-        "UMASK",
-        "LANG",
-        "LANGUAGE",
-        "LC_ALL",
-        "PATH",
-        "HOME",
-        "USER",
-        "UID",
-        "GID",
-        "WORKDIR",
-        "VERSION",
-    }
-
-    if key_upper in NON_SECRET_KEYS:
+    if key_upper in _NON_SECRET_KEYS:
         return False
 
     # 2. Public URLs (not secrets)
@@ -441,22 +516,11 @@ def classify_secret(key: str, value: str) -> bool:
         return False
 
     # 3. Boolean/simple values (not secrets)
-    if value_lower in (
-        "true",
-        "false",
-        "yes",
-        "no",
-        "1",
-        "0",
-        "enabled",
-        "disabled",
-        "on",
-        "off",
-    ):
+    if value_lower in _BOOLEAN_VALUES:
         return False
 
     # 4. Too short to be a secret (< 8 characters)
-    if len(value) < 8:
+    if len(value) < MIN_SECRET_LENGTH:
         return False
 
     # 5. Numeric-only values (ports, IDs, etc.)
@@ -472,33 +536,7 @@ def classify_secret(key: str, value: str) -> bool:
         return False
 
     # 8. Secret key patterns (strong indicators of secrets)
-    SECRET_KEY_PATTERNS = [
-        "PASSWORD",
-        "PASSWD",
-        "PWD",
-        "SECRET",
-        "TOKEN",
-        "API_KEY",
-        "APIKEY",
-        "API",
-        "KEY",
-        "PRIVATE_KEY",
-        "PRIV_KEY",
-        "AUTH",
-        "CREDENTIAL",
-        "CREDS",
-        "SALT",
-        "HASH",
-        "ENCRYPTION_KEY",
-        "ENCRYPT",
-        "SIGNATURE",
-        "CERT",
-        "CERTIFICATE",
-        "LICENSE",
-        "SESSION",
-    ]
-
-    for pattern in SECRET_KEY_PATTERNS:
+    for pattern in _SECRET_KEY_PATTERNS:
         if pattern in key_upper:
             return True
 
@@ -527,6 +565,31 @@ def classify_secret(key: str, value: str) -> bool:
     return False
 
 
+def count_env_secrets(file_path: str) -> Tuple[int, int]:
+    """
+    Count secret and config entries in a .env file without keeping values.
+
+    Entries are classified as they are streamed, so only one verdict per key
+    is held in memory. A key assigned more than once is counted once, using
+    its last value, matching parse_env_file.
+
+    Args:
+        file_path: Path to .env file
+
+    Returns:
+        (secret_count, config_count)
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    verdicts: Dict[str, bool] = {}
+    for key, value in parse_env_file_stream(file_path):
+        verdicts[key] = may_be_secret(key, value) and classify_secret(key, value)
+
+    secret_count = sum(verdicts.values())
+    return secret_count, len(verdicts) - secret_count
+
+
 def backup_file(file_path: str) -> str:
     """
     Create timestamped backup of file.
@@ -559,40 +622,58 @@ def backup_file(file_path: str) -> str:
     return str(backup_path)
 
 
-def extract_compose_secrets(compose_data: Dict, service_name: str) -> Dict[str, str]:
-    """
-    Extract secrets from docker-compose service definition.
-
-    Args:
-        compose_data: Parsed docker-compose data
-        service_name: Service name to extract secrets from
-
-    Returns:
-        Dict of environment variable secrets found in the service
-    """
+def _service_env_secrets(service: Dict) -> Dict[str, str]:
+    """Classify the environment section of one compose service definition."""
     secrets = {}
 
-    services = compose_data.get("services", {})
-    service = services.get(service_name, {})
-
     # Extract from environment section
     environment = service.get("environment", {})
 
     # Environment can be dict or list format
     if isinstance(environment, dict):
         for key, value in environment.items():
-            if isinstance(value, str) and classify_secret(key, value):
+            if may_be_secret(key, value) and classify_secret(key, value):
                 secrets[key] = value
     elif isinstance(environment, list):
         for item in environment:
             if "=" in item:
                 key, value = item.split("=", 1)
-                if classify_secret(key, value):
+                if may_be_secret(key, value) and classify_secret(key, value):
                     secrets[key] = value
 
     return secrets
 
 
+def extract_compose_secrets(compose_data: Dict, service_name: str) -> Dict[str, str]:
+    """
+    Extract secrets from docker-compose service definition.
+
+    Args:
+        compose_data: Parsed docker-compose data
+        service_name: Service name to extract secrets from
+
+    Returns:
+        Dict of environment variable secrets found in the service
+    """
+    services = compose_data.get("services", {})
+    return _service_env_secrets(services.get(service_name, {}))
+
+
+def iter_compose_secrets(compose_data: Dict) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """
+    Extract secrets from every docker-compose service in a single walk.
+
+    Args:
+        compose_data: Parsed docker-compose data
+
+    Yields:
+        (service_name, secrets) for each service in file order; secrets is
+        empty for services without any
+    """
+    for service_name, service in compose_data.get("services", {}).items():
+        yield service_name, _service_env_secrets(service)
+
+
 def get_env_file_references(compose_data: Dict, service_name: str) -> List[str]:
     """
     Get list of env_file references from docker-compose service.
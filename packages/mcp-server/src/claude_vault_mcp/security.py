@@ -1,10 +1,32 @@
 """Security validation, confirmation prompts, and audit logging."""
 
+import atexit
+import bisect
+import functools
+import os
 import re
 import sys
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from queue import Empty, SimpleQueue
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+try:
+    import re2 as _pattern_engine
+except ImportError:  # google-re2 is in the optional speedups extra
+    _pattern_engine = re
+
+# Allowed characters for service and key names
+_NAME_RE = re.compile(r"^[a-zA-Z0-9_-]+$")
+
+# Allowed base directories for file operations
+_ALLOWED_DIRS = (
+    Path("/workspace/proxmox-services"),
+    Path("/workspace/configs"),
+    Path("/mnt/proxmox-services"),  # Alternative mount point
+)
+_ALLOWED_DIRS_TEXT = ", ".join(str(d) for d in _ALLOWED_DIRS)
 
 
 class ValidationError(Exception):
@@ -29,10 +51,13 @@ class SecurityValidator:
     ]
 
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def validate_service_name(name: str) -> None:
         """
         Validate service name format.
 
+        Results are memoized per process; invalid names raise and are not cached.
+
         Args:
             name: Service name to validate
 
@@ -45,7 +70,7 @@ class SecurityValidator:
         if len(name) > 64:
             raise ValidationError("Service name too long (max 64 characters)")
 
-        if not re.match(r"^[a-zA-Z0-9_-]+$", name):
+        if not _NAME_RE.match(name):
             raise ValidationError(
                 "Service name must contain only letters, numbers, dash, and underscore. "
                 "This prevents path traversal and injection attacks."
@@ -58,10 +83,13 @@ class SecurityValidator:
             )
 
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def validate_key_name(name: str) -> None:
         """
         Validate secret key name format.
 
+        Results are memoized per process; invalid names raise and are not cached.
+
         Args:
             name: Key name to validate
 
@@ -74,7 +102,7 @@ class SecurityValidator:
         if len(name) > 128:
             raise ValidationError("Key name too long (max 128 characters)")
 
-        if not re.match(r"^[a-zA-Z0-9_-]+$", name):
+        if not _NAME_RE.match(name):
             raise ValidationError(
                 "Key name must contain only letters, numbers, dash, and underscore"
             )
@@ -90,11 +118,48 @@ class SecurityValidator:
         Returns:
             List of detected pattern descriptions (empty if clean)
         """
-        warnings = []
-        for pattern, description in SecurityValidator.DANGEROUS_PATTERNS:
-            if re.search(pattern, value):
-                warnings.append(description)
-        return warnings
+        # One pass over the value; each match names the pattern that fired
+        found = {match.lastgroup for match in _DANGEROUS_RE.finditer(value)}
+        return _describe_dangerous_groups(found) if found else []
+
+    @staticmethod
+    def detect_dangerous_patterns_batch(values: Dict[str, str]) -> Dict[str, List[str]]:
+        """
+        Scan several values for dangerous patterns in a single regex pass.
+
+        Values are joined with a sentinel no pattern can match, and each match
+        is mapped back to its value by offset. Small batches fall back to
+        per-value scanning, where the join setup costs more than it saves.
+
+        Args:
+            values: Mapping of key to secret value
+
+        Returns:
+            Dict of key to detected pattern descriptions, in input order, for
+            keys with at least one match
+        """
+        if len(values) <= _BATCH_SCAN_MIN:
+            warnings = {}
+            for key, value in values.items():
+                detected = SecurityValidator.detect_dangerous_patterns(value)
+                if detected:
+                    warnings[key] = detected
+            return warnings
+
+        # Start offset of each value within the joined string
+        starts = []
+        offset = 0
+        for value in values.values():
+            starts.append(offset)
+            offset += len(value) + len(_BATCH_SENTINEL)
+
+        found: Dict[int, set] = {}
+        for match in _DANGEROUS_RE.finditer(_BATCH_SENTINEL.join(values.values())):
+            index = bisect.bisect_right(starts, match.start()) - 1
+            found.setdefault(index, set()).add(match.lastgroup)
+
+        keys = list(values)
+        return {keys[i]: _describe_dangerous_groups(found[i]) for i in sorted(found)}
 
     @staticmethod
     def validate_secret_value(value: str) -> None:
@@ -131,29 +196,11 @@ class SecurityValidator:
         except Exception as e:
             raise ValidationError(f"Invalid file path: {e}")
 
-        # Allowed base directories
-        allowed_dirs = [
-            Path("/workspace/proxmox-services"),
-            Path("/workspace/configs"),
-            Path("/mnt/proxmox-services"),  # Alternative mount point
-        ]
-
         # Check if path is within allowed directories
-        is_allowed = False
-        for base_dir in allowed_dirs:
-            try:
-                # Check if abs_path is relative to base_dir
-                abs_path.relative_to(base_dir)
-                is_allowed = True
-                break
-            except ValueError:
-                # Not relative to this base dir, try next
-                continue
-
-        if not is_allowed:
+        if not any(abs_path.is_relative_to(base_dir) for base_dir in _ALLOWED_DIRS):
             raise ValidationError(
                 f"File path outside allowed directories: {path}\n"
-                f"Allowed directories: {', '.join(str(d) for d in allowed_dirs)}"
+                f"Allowed directories: {_ALLOWED_DIRS_TEXT}"
             )
 
         # Prevent symlink attacks
@@ -172,12 +219,28 @@ class SecurityValidator:
         Raises:
             ValidationError if file too large
         """
-        path = Path(file_path)
-
-        if not path.exists():
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
             raise ValidationError(f"File not found: {file_path}")
 
-        size_bytes = path.stat().st_size
+        SecurityValidator.validate_file_size_from_stat(st, max_size_mb)
+
+    @staticmethod
+    def validate_file_size_from_stat(st: os.stat_result, max_size_mb: int = 5) -> None:
+        """
+        Validate file size from an existing stat result to prevent DoS.
+
+        Lets callers that already stat'ed the file skip a second syscall.
+
+        Args:
+            st: Result of os.stat() for the file
+            max_size_mb: Maximum size in megabytes
+
+        Raises:
+            ValidationError if file too large
+        """
+        size_bytes = st.st_size
         max_bytes = max_size_mb * 1024 * 1024
 
         if size_bytes > max_bytes:
@@ -185,6 +248,31 @@ class SecurityValidator:
             raise ValidationError(f"File too large: {size_mb:.1f}MB (max {max_size_mb}MB)")
 
 
+# All dangerous patterns fused into one alternation; group p{i} is pattern i.
+# Compiled with RE2 (linear-time automaton) when google-re2 is installed.
+_DANGEROUS_GROUPS = [f"p{i}" for i in range(len(SecurityValidator.DANGEROUS_PATTERNS))]
+_DANGEROUS_RE = _pattern_engine.compile(
+    "|".join(
+        f"(?P<{group}>{pattern})"
+        for group, (pattern, _) in zip(_DANGEROUS_GROUPS, SecurityValidator.DANGEROUS_PATTERNS)
+    )
+)
+
+# Batch scanning: values are joined with a sentinel no dangerous pattern
+# matches, and batches up to _BATCH_SCAN_MIN values are scanned one by one
+_BATCH_SENTINEL = "\x01\x01"
+_BATCH_SCAN_MIN = 8
+
+
+def _describe_dangerous_groups(found: Set[str]) -> List[str]:
+    """Map matched group names back to descriptions, in DANGEROUS_PATTERNS order."""
+    return [
+        description
+        for group, (_, description) in zip(_DANGEROUS_GROUPS, SecurityValidator.DANGEROUS_PATTERNS)
+        if group in found
+    ]
+
+
 class ConfirmationPrompt:
     """Interactive confirmation for write operations."""
 
@@ -267,19 +355,115 @@ class AuditLogger:
         """
         Write audit log entry.
 
+        The entry is appended by a background writer thread, so this never
+        blocks on disk I/O. Use flush() to wait for it to reach the file.
+
         Args:
             action: Action performed (SUCCESS, FAILED, CONFIRMED, ABORTED, etc.)
             service: Service name
             details: Additional details
             user: User/source of the action
         """
+        self.log_many([(action, service, details)], user=user)
+
+    def log_many(self, events: List[Tuple[str, str, str]], user: str = "mcp-server"):
+        """
+        Write several audit log entries with one shared timestamp.
+
+        Args:
+            events: (action, service, details) tuples, in order
+            user: User/source of the actions
+        """
+        if not events:
+            return
+
         timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
-        log_entry = "[{0}] USER={1} ACTION={2} SERVICE={3} DETAILS={4}\n".format(
-            timestamp, user, action, service, details
+        log_entries = "".join(
+            f"[{timestamp}] USER={user} ACTION={action} SERVICE={service} DETAILS={details}\n"
+            for action, service, details in events
         )
 
+        _start_audit_writer()
+        _AUDIT_QUEUE.put((str(self.log_path), log_entries.encode("utf-8")))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every entry logged so far has been written to disk.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the queue was drained, False on timeout
+        """
+        return _flush_audit_queue(timeout)
+
+
+# Audit entries are appended by a single daemon thread so callers never block
+# on disk I/O. Queue items are (log path, encoded entry), or (None, Event) as
+# a flush marker that is set once everything queued before it is written.
+_AUDIT_QUEUE: "SimpleQueue[Tuple[Optional[str], Any]]" = SimpleQueue()
+_AUDIT_WRITER: Optional[threading.Thread] = None
+_AUDIT_WRITER_LOCK = threading.Lock()
+
+
+def _start_audit_writer() -> None:
+    """Start the background audit writer on first use."""
+    global _AUDIT_WRITER
+    if _AUDIT_WRITER is not None:
+        return
+    with _AUDIT_WRITER_LOCK:
+        if _AUDIT_WRITER is None:
+            _AUDIT_WRITER = threading.Thread(
+                target=_audit_writer_loop, name="vault-audit-writer", daemon=True
+            )
+            _AUDIT_WRITER.start()
+            atexit.register(_flush_audit_queue, 5.0)
+
+
+def _flush_audit_queue(timeout: Optional[float] = None) -> bool:
+    """Block until the audit writer has drained everything queued so far."""
+    if _AUDIT_WRITER is None:
+        return True
+    done = threading.Event()
+    _AUDIT_QUEUE.put((None, done))
+    return done.wait(timeout)
+
+
+def _append_entries(path: str, entries: List[bytes]) -> None:
+    """Append entries to an audit log file with a single O_APPEND write."""
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
         try:
-            with open(self.log_path, "a") as f:
-                f.write(log_entry)
-        except Exception as e:
-            print(f"Warning: Could not write to audit log: {e}", file=sys.stderr)
+            view = memoryview(b"".join(entries))
+            while view:
+                view = view[os.write(fd, view) :]
+        finally:
+            os.close(fd)
+    except Exception as e:
+        print(f"Warning: Could not write to audit log: {e}", file=sys.stderr)
+
+
+def _audit_writer_loop() -> None:
+    """Drain the audit queue, writing consecutive entries for a file together."""
+    while True:
+        batch = [_AUDIT_QUEUE.get()]
+        while True:
+            try:
+                batch.append(_AUDIT_QUEUE.get_nowait())
+            except Empty:
+                break
+
+        current_path: Optional[str] = None
+        entries: List[bytes] = []
+        for path, item in batch:
+            if path != current_path and entries:
+                _append_entries(current_path, entries)
+                entries = []
+            if path is None:
+                item.set()  # Flush marker: everything before it is written
+            else:
+                entries.append(item)
+            current_path = path
+        if entries:
+            _append_entries(current_path, entries)
@@ -31,6 +31,9 @@ TOOL_HANDLERS = {
     "vault_generate_example": VaultGenerateExampleTool(),
 }
 
+# Tool descriptions are static, so build the list_tools response once
+TOOL_DESCRIPTIONS = [handler.get_tool_description() for handler in TOOL_HANDLERS.values()]
+
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
@@ -40,7 +43,7 @@ async def list_tools() -> list[Tool]:
     Returns:
         List of Tool descriptions for MCP
     """
-    return [handler.get_tool_description() for handler in TOOL_HANDLERS.values()]
+    return list(TOOL_DESCRIPTIONS)
 
 
 @app.call_tool()
@@ -68,6 +71,10 @@ async def call_tool(name: str, arguments: dict) -> Sequence[TextContent]:
         ]
 
     try:
+        # Prefer the async handler when a tool provides one
+        run_tool_async = getattr(handler, "run_tool_async", None)
+        if run_tool_async is not None:
+            return await run_tool_async(arguments)
         return handler.run_tool(arguments)
     except Exception as e:
         return [
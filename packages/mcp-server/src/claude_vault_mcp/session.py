@@ -1,9 +1,16 @@
 """Session management for Vault authentication via environment variables."""
 
+import hashlib
 import os
 import time
 from dataclasses import dataclass
-from typing import Optional
+from functools import cached_property
+from typing import Optional, Tuple
+
+
+def _fingerprint(token: str) -> bytes:
+    """First 16 bytes of SHA-256(token), used in place of the raw token."""
+    return hashlib.sha256(token.encode()).digest()[:16]
 
 
 @dataclass
@@ -44,6 +51,19 @@ class VaultSession:
             vault_token_expiry=expiry if expiry else 0,
         )
 
+    @cached_property
+    def token_fingerprint(self) -> bytes:
+        """
+        Stable, non-reversible identifier for the session token.
+
+        Use this instead of the raw token as cache-key material so tokens never
+        end up in dict keys, reprs or logs. Computed once per session object.
+
+        Returns:
+            First 16 bytes of SHA-256(vault_token)
+        """
+        return _fingerprint(self.vault_token)
+
     def is_valid(self) -> bool:
         """
         Check if the session is still valid (not expired).
@@ -109,3 +129,45 @@ Please re-authenticate:
   source claude-vault login"""
 
         return ""  # Valid
+
+
+# Error message for a missing session. It does not depend on any session state,
+# so it is rendered once at import instead of on every unauthenticated call.
+NO_SESSION_ERROR = VaultSession(
+    vault_addr="", vault_token="", vault_token_expiry=0
+).validate_or_error()
+
+# Last session built from the environment, keyed by the env values it was built
+# from, with the token fingerprinted rather than stored a second time:
+# ((VAULT_ADDR, token fingerprint, VAULT_TOKEN_EXPIRY), session)
+_session_cache: Tuple[Tuple[Optional[object], ...], Optional[VaultSession]] = (
+    (None, None, None),
+    None,
+)
+
+
+def get_session() -> Optional[VaultSession]:
+    """
+    Get the Vault session from environment variables, reusing the last one.
+
+    A new VaultSession is only built when one of the Vault environment
+    variables changes, so repeated tool calls share one object (and its
+    cached token fingerprint). Expiry is still checked by the caller via
+    validate_or_error().
+
+    Returns:
+        VaultSession if all required env vars are present, None otherwise
+    """
+    global _session_cache
+
+    token = os.getenv("VAULT_TOKEN")
+    key = (
+        os.getenv("VAULT_ADDR"),
+        _fingerprint(token) if token else None,
+        os.getenv("VAULT_TOKEN_EXPIRY"),
+    )
+    cached_key, session = _session_cache
+    if key != cached_key:
+        session = VaultSession.from_environment()
+        _session_cache = (key, session)
+    return session
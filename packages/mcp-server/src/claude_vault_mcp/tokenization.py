@@ -11,7 +11,7 @@ import re
 import secrets
 import time
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 
 class TokenVault:
@@ -101,6 +101,48 @@ class TokenVault:
 
         return token
 
+    def tokenize_many(self, items: List[Tuple[str, Optional[dict]]]) -> List[str]:
+        """
+        Tokenize a batch of values in one call.
+
+        Equivalent to calling tokenize() for each (value, metadata) pair, but
+        draws the random bytes for all new tokens at once and stamps them with
+        a single timestamp.
+
+        Args:
+            items: List of (value, metadata) tuples
+
+        Returns:
+            List of tokens, in the same order as items
+
+        Raises:
+            ValueError: If session has expired
+        """
+        if self._is_expired():
+            raise ValueError(
+                f"Token session {self.session_id} expired. Restart MCP server."
+            )
+
+        random_hex = secrets.token_hex(8 * len(items))  # 16 hex chars per token
+        created_at = datetime.now().isoformat()
+        tokens = []
+
+        for i, (value, metadata) in enumerate(items):
+            value_hash = self._hash_value(value)
+            token = self.value_to_token.get(value_hash)
+
+            if token is None:
+                token = f"@token-{random_hex[i * 16:(i + 1) * 16]}"
+                self.token_map[token] = value
+                self.value_to_token[value_hash] = token
+
+                if metadata:
+                    self.token_metadata[token] = {**metadata, "created_at": created_at}
+
+            tokens.append(token)
+
+        return tokens
+
     def detokenize(self, token: str) -> str:
         """
         Resolve token back to original value.
@@ -138,20 +180,39 @@ class TokenVault:
         Returns:
             Dictionary with all tokens replaced by values
         """
+        return self.detokenize_dict_counted(data)[0]
+
+    def detokenize_dict_counted(self, data: dict) -> Tuple[dict, int]:
+        """
+        Recursively detokenize all tokens in a dict, counting them as it goes.
+
+        Args:
+            data: Dictionary potentially containing tokens
+
+        Returns:
+            Tuple of (dictionary with all tokens replaced, number of tokens replaced)
+        """
         result = {}
+        count = 0
         for key, value in data.items():
             if isinstance(value, str) and value.startswith("@token-"):
                 result[key] = self.detokenize(value)
+                count += 1
             elif isinstance(value, dict):
-                result[key] = self.detokenize_dict(value)
+                result[key], nested = self.detokenize_dict_counted(value)
+                count += nested
             elif isinstance(value, list):
-                result[key] = [
-                    self.detokenize(v) if isinstance(v, str) and v.startswith("@token-") else v
-                    for v in value
-                ]
+                items = []
+                for v in value:
+                    if isinstance(v, str) and v.startswith("@token-"):
+                        items.append(self.detokenize(v))
+                        count += 1
+                    else:
+                        items.append(v)
+                result[key] = items
             else:
                 result[key] = value
-        return result
+        return result, count
 
     def detokenize_text(self, text: str) -> str:
         """
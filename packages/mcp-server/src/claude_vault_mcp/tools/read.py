@@ -1,17 +1,43 @@
 """Read-only Vault tools: vault_status, vault_list, vault_get."""
 
-import json
+# Responses are plain text. If a structured (JSON) response path is added,
+# serialize it with orjson.dumps rather than the stdlib json module.
+
+import asyncio
 import os
-import time
-from typing import Sequence
+from itertools import islice, starmap
+from typing import List, Optional, Sequence
 
 from mcp.types import TextContent, Tool
 
 from ..security import SecurityValidator, ValidationError
-from ..session import VaultSession
+from ..session import NO_SESSION_ERROR, VaultSession
 from ..tokenization import get_token_vault, should_tokenize_value
 from ..tools import ToolHandler
 from ..vault_client import VaultClient
+from ..vault_client_async import AsyncVaultClient
+
+# Maximum number of secret lines rendered in a single vault_get response.
+# Keeps the payload sent to the model bounded for very large services.
+MAX_LISTED_SECRETS = 500
+
+_NO_SESSION_CONTENT = TextContent(type="text", text=f"❌ {NO_SESSION_ERROR}")
+
+
+# Appended to every vault_get description; the list form is mode-independent
+_MULTI_SERVICE_NOTE = """
+
+Multiple services:
+  Pass a list of service names to fetch them concurrently in one call.
+  Results are returned in the order the services were given, e.g.
+  vault_get service=["jellyfin", "sonarr"]"""
+
+
+def _more_secrets_note(total: int) -> str:
+    """Trailer for secret listings truncated at MAX_LISTED_SECRETS."""
+    if total <= MAX_LISTED_SECRETS:
+        return ""
+    return f"\n  ... {total - MAX_LISTED_SECRETS} more"
 
 
 class VaultStatusTool(ToolHandler):
@@ -139,10 +165,7 @@ Returns structured data including metadata (version, timestamps).""",
         # Load and validate session
         session = VaultSession.from_environment()
         if not session:
-            error = VaultSession(
-                vault_addr="", vault_token="", vault_token_expiry=0
-            ).validate_or_error()
-            return [TextContent(type="text", text=f"❌ {error}")]
+            return [_NO_SESSION_CONTENT]
 
         error = session.validate_or_error()
         if error:
@@ -211,7 +234,7 @@ To register this service:
             created_time = metadata.get("created_time", "N/A")
             updated_time = metadata.get("updated_time", created_time)
 
-            keys_list = "\n".join(f"  • {key}" for key in secrets.keys())
+            keys_list = "\n".join(f"  • {key}" for key in secrets)
 
             return [
                 TextContent(
@@ -270,13 +293,19 @@ This tool helps you understand secret structure without exposing credentials."""
 
         return Tool(
             name=self.name,
-            description=description,
+            description=description + _MULTI_SERVICE_NOTE,
             inputSchema={
                 "type": "object",
                 "properties": {
                     "service": {
-                        "type": "string",
-                        "description": "Service name to retrieve secrets from",
+                        "anyOf": [
+                            {"type": "string"},
+                            {"type": "array", "items": {"type": "string"}, "minItems": 1},
+                        ],
+                        "description": (
+                            "Service name to retrieve secrets from, or a list of service "
+                            "names to retrieve concurrently"
+                        ),
                     },
                     "key": {
                         "type": "string",
@@ -291,10 +320,7 @@ This tool helps you understand secret structure without exposing credentials."""
         # Load and validate session
         session = VaultSession.from_environment()
         if not session:
-            error = VaultSession(
-                vault_addr="", vault_token="", vault_token_expiry=0
-            ).validate_or_error()
-            return [TextContent(type="text", text=f"❌ {error}")]
+            return [_NO_SESSION_CONTENT]
 
         error = session.validate_or_error()
         if error:
@@ -317,15 +343,73 @@ This tool helps you understand secret structure without exposing credentials."""
         if not response.success:
             return [TextContent(type="text", text=f"❌ {response.error}")]
 
-        secrets = response.data["secrets"]
+        return self._format_secrets(service, key, response.data["secrets"])
+
+    async def run_tool_async(self, arguments: dict) -> Sequence[TextContent]:
+        """
+        Async entry point preferred by the MCP server.
+
+        When ``service`` is a list, all services are fetched concurrently and
+        their results are returned in order. A single service goes through
+        run_tool unchanged.
+        """
+        services = arguments.get("service")
+        if not isinstance(services, list):
+            return self.run_tool(arguments)
+
+        # Load and validate session
+        session = VaultSession.from_environment()
+        if not session:
+            return [_NO_SESSION_CONTENT]
+
+        error = session.validate_or_error()
+        if error:
+            return [TextContent(type="text", text=f"❌ {error}")]
+
+        key = arguments.get("key")
+
+        # Validate inputs
+        try:
+            if not services:
+                raise ValidationError("Service list cannot be empty")
+            for service in services:
+                SecurityValidator.validate_service_name(service)
+            if key:
+                SecurityValidator.validate_key_name(key)
+        except ValidationError as e:
+            return [TextContent(type="text", text=f"❌ Validation error: {e}")]
+
+        rendered: List[Sequence[TextContent]] = [()] * len(services)
+
+        async with AsyncVaultClient(session.vault_addr, session.vault_token) as client:
+
+            async def fetch(index: int, service: str):
+                return index, service, await client.get_secret(service)
+
+            # Tokenize/format each service as soon as its response arrives,
+            # while reads for the remaining services are still in flight
+            for next_done in asyncio.as_completed(
+                [fetch(i, service) for i, service in enumerate(services)]
+            ):
+                index, service, response = await next_done
+                if not response.success:
+                    rendered[index] = [TextContent(type="text", text=f"❌ {response.error}")]
+                else:
+                    rendered[index] = self._format_secrets(service, key, response.data["secrets"])
+
+        return [content for contents in rendered for content in contents]
 
+    def _format_secrets(
+        self, service: str, key: Optional[str], secrets: dict
+    ) -> Sequence[TextContent]:
+        """Render one service's secrets according to VAULT_SECURITY_MODE."""
         # Check security mode (default: tokenized)
         security_mode = os.getenv("VAULT_SECURITY_MODE", "tokenized")
 
         if key:
             # Return specific key
             if key not in secrets:
-                available_keys = ", ".join(secrets.keys())
+                available_keys = ", ".join(secrets)
                 return [
                     TextContent(
                         type="text",
@@ -411,7 +495,9 @@ Value: <REDACTED>
                         tokenized[k] = v
                         stats["plaintext"] += 1
 
-                secrets_formatted = "\n".join(f"  {k}: {v}" for k, v in tokenized.items())
+                secrets_formatted = "\n".join(
+                    starmap("  {}: {}".format, islice(tokenized.items(), MAX_LISTED_SECRETS))
+                ) + _more_secrets_note(len(tokenized))
 
                 return [
                     TextContent(
@@ -443,7 +529,9 @@ Value: <REDACTED>
 
             elif security_mode == "redacted":
                 # Show keys only, redact values
-                secrets_formatted = "\n".join(f"  {k}: <REDACTED>" for k in secrets.keys())
+                secrets_formatted = "\n".join(
+                    map("  {}: <REDACTED>".format, islice(secrets, MAX_LISTED_SECRETS))
+                ) + _more_secrets_note(len(secrets))
 
                 return [
                     TextContent(
@@ -468,7 +556,9 @@ Value: <REDACTED>
                 ]
 
             else:  # plaintext
-                secrets_formatted = "\n".join(f"  {k}: {v}" for k, v in secrets.items())
+                secrets_formatted = "\n".join(
+                    starmap("  {}: {}".format, islice(secrets.items(), MAX_LISTED_SECRETS))
+                ) + _more_secrets_note(len(secrets))
 
                 return [
                     TextContent(
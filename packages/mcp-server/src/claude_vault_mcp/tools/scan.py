@@ -1,23 +1,255 @@
 """Scan tools: vault_scan_env, vault_scan_compose."""
 
-from pathlib import Path
-from typing import Sequence
+import io
+import os
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from mcp.types import TextContent, Tool
 
-from ..approval_server import get_approval_server
+from ..approval_server import ApprovalServer, get_approval_server
 from ..file_parsers import (
     classify_secret,
-    extract_compose_secrets,
+    count_env_secrets,
     get_env_file_references,
+    iter_compose_secrets,
+    may_be_secret,
     parse_docker_compose,
     parse_env_file,
 )
+from ..migration_state import mark_scanned
 from ..security import AuditLogger, SecurityValidator, ValidationError
-from ..session import VaultSession
+from ..session import NO_SESSION_ERROR, get_session
 from ..tokenization import get_token_vault
 from ..tools import ToolHandler
 
+# Static input schemas, shared by every description lookup
+_ENV_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "service": {
+            "type": "string",
+            "description": "Service name (e.g., 'jellyfin', 'sonarr')",
+        },
+        "file_path": {
+            "type": "string",
+            "description": (
+                "Optional: Path to .env file "
+                "(default: /workspace/proxmox-services/{service}/.env)"
+            ),
+        },
+        "approval_token": {
+            "type": "string",
+            "description": (
+                "Approval token from WebAuthn authentication. "
+                "Only provide after user has approved via the web UI."
+            ),
+        },
+    },
+    "required": ["service"],
+}
+
+_COMPOSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "service": {
+            "type": "string",
+            "description": "Service name (e.g., 'jellyfin', 'sonarr')",
+        },
+        "file_path": {
+            "type": "string",
+            "description": (
+                "Optional: Path to docker-compose.yml "
+                "(default: /workspace/proxmox-services/{service}/"
+                "docker-compose.yml)"
+            ),
+        },
+        "approval_token": {
+            "type": "string",
+            "description": (
+                "Approval token from WebAuthn authentication. "
+                "Only provide after user has approved via the web UI."
+            ),
+        },
+    },
+    "required": ["service"],
+}
+
+# Phase-1 approval prompts, rendered with format_map
+_ENV_CHECKPOINT_TMPL = (
+    "⚠️ SECURITY CHECKPOINT - SCAN APPROVAL REQUIRED\n\n"
+    "This operation will read secrets from:\n"
+    "  File: {file_path}\n"
+    "  Detected: {secret_count} potential secret(s)\n"
+    "  Config values: {config_count}\n\n"
+    "The secrets will be tokenized (replaced with @token-xxx tokens) "
+    "so AI never sees plaintext values.\n\n"
+    "To approve this scan:\n"
+    "  1. Open: {approval_url}\n"
+    "  2. Review scan details\n"
+    "  3. Authenticate with WebAuthn (TouchID/Windows Hello/YubiKey)\n\n"
+    "After approval, call:\n"
+    '  vault_scan_env(service="{service}", approval_token="{op_id}")'
+)
+
+_COMPOSE_CHECKPOINT_TMPL = (
+    "⚠️ SECURITY CHECKPOINT - SCAN APPROVAL REQUIRED\n\n"
+    "This operation will read secrets from:\n"
+    "  File: {file_path}\n"
+    "  Detected: {secret_count} potential secret(s) in {container_count} container(s)\n"
+    "  Containers: {containers}\n\n"
+    "The secrets will be tokenized (replaced with @token-xxx tokens).\n\n"
+    "To approve this scan:\n"
+    "  1. Open: {approval_url}\n"
+    "  2. Review scan details\n"
+    "  3. Authenticate with WebAuthn\n\n"
+    "After approval, call:\n"
+    '  vault_scan_compose(service="{service}", approval_token="{op_id}")'
+)
+
+# Compose file names tried, in order, when docker-compose.yml is missing
+_COMPOSE_ALT_NAMES = ("docker-compose.yaml", "compose.yml", "compose.yaml")
+
+# Phase-1 parse results keyed by op_id, reused by Phase 3 while the file is
+# unchanged: op_id -> (created_at, file_path, st_mtime_ns, st_size, parsed data).
+# The parsed data holds plaintext values, so entries live no longer than the
+# approval they belong to.
+_PARSED_CACHE: Dict[str, Tuple[float, str, int, int, Any]] = {}
+_PARSED_CACHE_MAX = 64
+_PARSED_CACHE_TTL = 300.0  # seconds, the lifetime of a pending approval
+
+
+# Completed Phase-3 responses, so a retried call with the same approval token
+# returns the same tokens instead of failing once the approval is consumed:
+# (tool name, approval_token, service, file_path) -> (expires_at, response)
+_SCAN_RESULT_CACHE: Dict[Tuple[str, ...], Tuple[float, Sequence[TextContent]]] = {}
+_SCAN_RESULT_TTL = 60.0  # seconds
+
+# Migration-state updates run off the response path. A single worker keeps
+# read-modify-write cycles on the shared state file ordered.
+_IO_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vault-state")
+
+
+def _warn_on_failure(future: Future) -> None:
+    """Report background bookkeeping errors instead of dropping them silently."""
+    exc = future.exception()
+    if exc is not None:
+        print(f"Warning: Background scan bookkeeping failed: {exc}", file=sys.stderr)
+
+
+def _submit_io(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+    """Run a fire-and-forget I/O call on the background pool."""
+    _IO_POOL.submit(fn, *args, **kwargs).add_done_callback(_warn_on_failure)
+
+
+# Approval server singleton, resolved on first use
+_APPROVAL_SERVER: Optional[ApprovalServer] = None
+
+
+def _approval() -> ApprovalServer:
+    """Return the approval server, binding the global instance once."""
+    global _APPROVAL_SERVER
+    if _APPROVAL_SERVER is None:
+        _APPROVAL_SERVER = get_approval_server()
+    return _APPROVAL_SERVER
+
+
+def _cached_scan_result(key: Tuple[str, ...]) -> Optional[Sequence[TextContent]]:
+    """Return a completed scan response for a retried call, if still fresh."""
+    cached = _SCAN_RESULT_CACHE.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    return None
+
+
+def _remember_scan_result(key: Tuple[str, ...], result: Sequence[TextContent]) -> None:
+    """Keep a completed scan response so a retry with the same token is idempotent."""
+    now = time.monotonic()
+    # Lazily purge expired entries
+    for stale in [k for k, (expires, _) in _SCAN_RESULT_CACHE.items() if expires <= now]:
+        del _SCAN_RESULT_CACHE[stale]
+    _SCAN_RESULT_CACHE[key] = (now + _SCAN_RESULT_TTL, result)
+
+
+def _stat_or_none(file_path: str) -> Optional[os.stat_result]:
+    """Stat a file once so existence, size and mtime checks share one syscall."""
+    try:
+        return os.stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _find_compose_alternative(service_dir: str) -> Optional[Tuple[str, os.stat_result]]:
+    """
+    Find an alternative compose file name with a single directory listing.
+
+    Args:
+        service_dir: Service directory to look in
+
+    Returns:
+        (path, stat result) of the first match in _COMPOSE_ALT_NAMES order,
+        or None if there is none
+    """
+    try:
+        with os.scandir(service_dir) as it:
+            found = {
+                entry.name: entry
+                for entry in it
+                if entry.name in _COMPOSE_ALT_NAMES and entry.is_file(follow_symlinks=False)
+            }
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+    for name in _COMPOSE_ALT_NAMES:
+        entry = found.get(name)
+        if entry is not None:
+            try:
+                return entry.path, entry.stat()
+            except FileNotFoundError:
+                continue
+    return None
+
+
+def _evict_stale_parsed() -> None:
+    """Drop cached parses whose approval window has passed."""
+    # Entries are inserted in creation order, so expired ones are at the front
+    cutoff = time.monotonic() - _PARSED_CACHE_TTL
+    while _PARSED_CACHE:
+        op_id = next(iter(_PARSED_CACHE))
+        if _PARSED_CACHE[op_id][0] > cutoff:
+            break
+        del _PARSED_CACHE[op_id]
+
+
+def _cache_parsed(op_id: str, file_path: str, st: os.stat_result, data: Any) -> None:
+    """Remember a Phase-1 parse result for the pending operation."""
+    _evict_stale_parsed()
+    _PARSED_CACHE[op_id] = (time.monotonic(), file_path, st.st_mtime_ns, st.st_size, data)
+    # Evict the oldest entries (operations that were never executed)
+    while len(_PARSED_CACHE) > _PARSED_CACHE_MAX:
+        del _PARSED_CACHE[next(iter(_PARSED_CACHE))]
+
+
+def _discard_parsed(op_id: str) -> None:
+    """Forget the Phase-1 parse for an operation that will not be executed."""
+    _evict_stale_parsed()
+    _PARSED_CACHE.pop(op_id, None)
+
+
+def _load_parsed(
+    op_id: str, file_path: str, st: os.stat_result, parse: Callable[[str], Any]
+) -> Any:
+    """Reuse the Phase-1 parse for op_id if the file is unchanged, otherwise re-parse."""
+    _evict_stale_parsed()
+    cached = _PARSED_CACHE.pop(op_id, None)
+    if cached is not None:
+        _, cached_path, mtime_ns, size, data = cached
+        if (cached_path, mtime_ns, size) == (file_path, st.st_mtime_ns, st.st_size):
+            return data
+    return parse(file_path)
+
 
 class VaultScanEnvTool(ToolHandler):
     """Tool for scanning .env files and tokenizing secrets."""
@@ -25,9 +257,7 @@ class VaultScanEnvTool(ToolHandler):
     def __init__(self):
         super().__init__("vault_scan_env")
         self.audit_logger = AuditLogger()
-
-    def get_tool_description(self) -> Tool:
-        return Tool(
+        self._tool_desc = Tool(
             name=self.name,
             description="""Scan .env files for secrets and tokenize them before sending to AI.
 
@@ -67,40 +297,17 @@ Tokenization:
 - Non-sensitive config (ports, URLs, booleans) sent as plaintext
 - Tokens valid for session lifetime (2h default)
 - Use vault_set to store tokenized secrets to Vault""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "service": {
-                        "type": "string",
-                        "description": "Service name (e.g., 'jellyfin', 'sonarr')",
-                    },
-                    "file_path": {
-                        "type": "string",
-                        "description": (
-                            "Optional: Path to .env file "
-                            "(default: /workspace/proxmox-services/{service}/.env)"
-                        ),
-                    },
-                    "approval_token": {
-                        "type": "string",
-                        "description": (
-                            "Approval token from WebAuthn authentication. "
-                            "Only provide after user has approved via the web UI."
-                        ),
-                    },
-                },
-                "required": ["service"],
-            },
+            inputSchema=_ENV_SCHEMA,
         )
 
+    def get_tool_description(self) -> Tool:
+        return self._tool_desc
+
     def run_tool(self, arguments: dict) -> Sequence[TextContent]:
         # Load and validate session
-        session = VaultSession.from_environment()
+        session = get_session()
         if not session:
-            error = VaultSession(
-                vault_addr="", vault_token="", vault_token_expiry=0
-            ).validate_or_error()
-            return [TextContent(type="text", text=f"❌ {error}")]
+            return [TextContent(type="text", text=f"❌ {NO_SESSION_ERROR}")]
 
         error = session.validate_or_error()
         if error:
@@ -126,8 +333,9 @@ Tokenization:
         except ValidationError as e:
             return [TextContent(type="text", text=f"❌ {e}")]
 
-        # Check if file exists
-        if not Path(file_path).exists():
+        # Check if file exists (the stat result is reused for size/mtime checks)
+        st = _stat_or_none(file_path)
+        if st is None:
             return [
                 TextContent(
                     type="text",
@@ -144,32 +352,24 @@ You can use vault_list to see available services.""",
 
         # PHASE 1: Create pending scan operation
         if not approval_token:
-            return self._create_pending_scan(service, file_path)
+            return self._create_pending_scan(service, file_path, st)
 
         # PHASE 3: Execute scan with approval
         return self._execute_scan(service, file_path, approval_token)
 
-    def _create_pending_scan(self, service: str, file_path: str) -> Sequence[TextContent]:
+    def _create_pending_scan(
+        self, service: str, file_path: str, st: os.stat_result
+    ) -> Sequence[TextContent]:
         """Phase 1: Create pending scan operation."""
         try:
             # Validate file size
-            SecurityValidator.validate_file_size(file_path, max_size_mb=5)
-
-            # Parse file to get count of secrets (don't tokenize yet)
-            env_data = parse_env_file(file_path)
+            SecurityValidator.validate_file_size_from_stat(st, max_size_mb=5)
 
-            # Classify secrets
-            secret_count = 0
-            config_count = 0
-
-            for key, value in env_data.items():
-                if classify_secret(key, value):
-                    secret_count += 1
-                else:
-                    config_count += 1
+            # Count secrets without materializing the file (don't tokenize yet)
+            secret_count, config_count = count_env_secrets(file_path)
 
             # Create pending operation
-            approval_server = get_approval_server()
+            approval_server = _approval()
 
             op_id = approval_server.create_operation(
                 service=service,
@@ -187,26 +387,22 @@ You can use vault_list to see available services.""",
             self.audit_logger.log(
                 service=service,
                 action="SCAN_ENV_REQUESTED",
-                details="file={} potential_secrets={} config={} op_id={}".format(
-                    file_path, secret_count, config_count, op_id
+                details=(
+                    f"file={file_path} potential_secrets={secret_count} "
+                    f"config={config_count} op_id={op_id}"
                 ),
             )
 
-            msg = (
-                "⚠️ SECURITY CHECKPOINT - SCAN APPROVAL REQUIRED\n\n"
-                "This operation will read secrets from:\n"
-                "  File: {}\n"
-                "  Detected: {} potential secret(s)\n"
-                "  Config values: {}\n\n"
-                "The secrets will be tokenized (replaced with @token-xxx tokens) "
-                "so AI never sees plaintext values.\n\n"
-                "To approve this scan:\n"
-                "  1. Open: {}\n"
-                "  2. Review scan details\n"
-                "  3. Authenticate with WebAuthn (TouchID/Windows Hello/YubiKey)\n\n"
-                "After approval, call:\n"
-                '  vault_scan_env(service="{}", approval_token="{}")'
-            ).format(file_path, secret_count, config_count, approval_url, service, op_id)
+            msg = _ENV_CHECKPOINT_TMPL.format_map(
+                {
+                    "file_path": file_path,
+                    "secret_count": secret_count,
+                    "config_count": config_count,
+                    "approval_url": approval_url,
+                    "service": service,
+                    "op_id": op_id,
+                }
+            )
             return [TextContent(type="text", text=msg)]
 
         except ValidationError as e:
@@ -223,61 +419,63 @@ You can use vault_list to see available services.""",
         self, service: str, file_path: str, approval_token: str
     ) -> Sequence[TextContent]:
         """Phase 3: Execute scan with approval."""
+        # A retry of an already completed scan gets the same response back
+        cache_key = (self.name, approval_token, service, file_path)
+        cached = _cached_scan_result(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             # Verify approval
-            approval_server = get_approval_server()
+            approval_server = _approval()
 
             if not approval_server.check_approval(approval_token):
                 msg = (
                     "❌ Operation not approved or expired.\n\n"
                     "Please restart the approval workflow:\n"
-                    '  1. Call vault_scan_env(service="{}") without approval_token\n'
+                    f'  1. Call vault_scan_env(service="{service}") without approval_token\n'
                     "  2. Open the approval URL in your browser\n"
                     "  3. Complete WebAuthn authentication\n"
                     "  4. Call again with the approval token"
-                ).format(service)
+                )
                 return [TextContent(type="text", text=msg)]
 
-            # Re-read and parse file
+            # Parse file
             env_data = parse_env_file(file_path)
 
             # Get TokenVault
             vault = get_token_vault()
+            base_metadata = {"service": service, "source": "env_scan", "file": file_path}
 
-            # Classify and tokenize secrets
-            tokenized_secrets = {}
-            non_secrets = {}
+            # Classify and render each entry in a single pass; secrets are
+            # collected and tokenized in one batch afterwards
+            secret_keys = []
+            pending = []
+            config_parts = []
 
             for key, value in env_data.items():
-                if classify_secret(key, value):
-                    # Tokenize secret
-                    token = vault.tokenize(
-                        value,
-                        metadata={
-                            "service": service,
-                            "key": key,
-                            "source": "env_scan",
-                            "file": file_path,
-                        },
-                    )
-                    tokenized_secrets[key] = token
+                if may_be_secret(key, value) and classify_secret(key, value):
+                    secret_keys.append(key)
+                    pending.append((value, {"key": key, **base_metadata}))
                 else:
-                    # Non-secret config - send as plaintext
-                    non_secrets[key] = value
+                    # Non-secret config - send as plaintext (truncate long values)
+                    display_value = value[:50] + "..." if len(value) > 50 else value
+                    config_parts.append(f"  • {key}: {display_value}\n")
 
-            # Audit log
+            tokens = vault.tokenize_many(pending)
+            secret_parts = [f"  • {key}: {token}\n" for key, token in zip(secret_keys, tokens)]
+
+            secret_count = len(secret_parts)
+            config_count = len(config_parts)
+
+            # Audit log and migration state are both written in the background
             self.audit_logger.log(
                 service=service,
                 action="SCAN_ENV_SUCCESS",
-                details="file={} secrets={} config={}".format(
-                    file_path, len(tokenized_secrets), len(non_secrets)
-                ),
+                details=f"file={file_path} secrets={secret_count} config={config_count}",
             )
 
-            # Mark as scanned in migration state
-            from ..migration_state import mark_scanned
-
-            mark_scanned(service, [file_path], len(tokenized_secrets))
+            _submit_io(mark_scanned, service, [file_path], secret_count)
 
             # Cleanup approved operation
             approval_server.cleanup_operation(approval_token)
@@ -285,26 +483,21 @@ You can use vault_list to see available services.""",
             # Format response
             response_parts = [
                 "✅ Scan completed successfully!\n\n",
-                "**Service:** {}\n".format(service),
-                "**File:** {}\n\n".format(file_path),
+                f"**Service:** {service}\n",
+                f"**File:** {file_path}\n\n",
                 "**Secrets Found (tokenized):**\n",
+                *secret_parts,
             ]
 
-            for key, token in tokenized_secrets.items():
-                response_parts.append("  • {}: {}\n".format(key, token))
-
-            if non_secrets:
+            if config_parts:
                 response_parts.append("\n**Configuration Values (plaintext):**\n")
-                for key, value in non_secrets.items():
-                    # Truncate long values
-                    display_value = value[:50] + "..." if len(value) > 50 else value
-                    response_parts.append("  • {}: {}\n".format(key, display_value))
+                response_parts.extend(config_parts)
 
             response_parts.append(
                 "\n**Summary:**\n"
-                "- Total keys: {}\n"
-                "- Secrets tokenized: {}\n"
-                "- Config values: {}\n\n"
+                f"- Total keys: {secret_count + config_count}\n"
+                f"- Secrets tokenized: {secret_count}\n"
+                f"- Config values: {config_count}\n\n"
                 "**Next Steps:**\n"
                 "1. Review the secrets and decide which to migrate to Vault\n"
                 "2. Use vault_set to store tokenized secrets\n\n"
@@ -312,10 +505,12 @@ You can use vault_list to see available services.""",
                 "Tokens are session-scoped and expire with your Vault session "
                 "(2h default).\n"
                 "The tokenization system ensures AI never sees plaintext "
-                "secret values.".format(len(env_data), len(tokenized_secrets), len(non_secrets))
+                "secret values."
             )
 
-            return [TextContent(type="text", text="".join(response_parts))]
+            result = [TextContent(type="text", text="".join(response_parts))]
+            _remember_scan_result(cache_key, result)
+            return result
 
         except Exception as e:
             self.audit_logger.log(service=service, action="SCAN_ENV_FAILED", details=str(e))
@@ -333,9 +528,7 @@ class VaultScanComposeTool(ToolHandler):
     def __init__(self):
         super().__init__("vault_scan_compose")
         self.audit_logger = AuditLogger()
-
-    def get_tool_description(self) -> Tool:
-        return Tool(
+        self._tool_desc = Tool(
             name=self.name,
             description="""Scan docker-compose.yml files for secrets and tokenize them.
 
@@ -361,41 +554,17 @@ Extracts secrets from:
 Notes:
 - env_file references are noted but not scanned (use vault_scan_env for those)
 - Secrets section (Docker Swarm) is noted but not extracted""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "service": {
-                        "type": "string",
-                        "description": "Service name (e.g., 'jellyfin', 'sonarr')",
-                    },
-                    "file_path": {
-                        "type": "string",
-                        "description": (
-                            "Optional: Path to docker-compose.yml "
-                            "(default: /workspace/proxmox-services/{service}/"
-                            "docker-compose.yml)"
-                        ),
-                    },
-                    "approval_token": {
-                        "type": "string",
-                        "description": (
-                            "Approval token from WebAuthn authentication. "
-                            "Only provide after user has approved via the web UI."
-                        ),
-                    },
-                },
-                "required": ["service"],
-            },
+            inputSchema=_COMPOSE_SCHEMA,
         )
 
+    def get_tool_description(self) -> Tool:
+        return self._tool_desc
+
     def run_tool(self, arguments: dict) -> Sequence[TextContent]:
         # Load and validate session
-        session = VaultSession.from_environment()
+        session = get_session()
         if not session:
-            error = VaultSession(
-                vault_addr="", vault_token="", vault_token_expiry=0
-            ).validate_or_error()
-            return [TextContent(type="text", text=f"❌ {error}")]
+            return [TextContent(type="text", text=f"❌ {NO_SESSION_ERROR}")]
 
         error = session.validate_or_error()
         if error:
@@ -421,45 +590,44 @@ Notes:
         except ValidationError as e:
             return [TextContent(type="text", text=f"❌ {e}")]
 
-        # Check if file exists
-        if not Path(file_path).exists():
-            # Try alternative names
-            alt_paths = [
-                f"/workspace/proxmox-services/{service}/docker-compose.yaml",
-                f"/workspace/proxmox-services/{service}/compose.yml",
-                f"/workspace/proxmox-services/{service}/compose.yaml",
-            ]
-
-            for alt_path in alt_paths:
-                if Path(alt_path).exists():
-                    file_path = alt_path
-                    break
-            else:
-                return [
-                    TextContent(
-                        type="text",
-                        text=f"""❌ Docker compose file not found.
+        # Check if file exists, falling back to alternative names. The stat
+        # result is reused for size/mtime checks.
+        service_dir = f"/workspace/proxmox-services/{service}"
+        st = _stat_or_none(file_path)
+        if st is None:
+            found = _find_compose_alternative(service_dir)
+            if found is not None:
+                file_path, st = found
+
+        if st is None:
+            alt_paths = [f"{service_dir}/{name}" for name in _COMPOSE_ALT_NAMES]
+            return [
+                TextContent(
+                    type="text",
+                    text=f"""❌ Docker compose file not found.
 
 Tried:
 - {file_path}
 - {chr(10).join('- ' + p for p in alt_paths)}
 
 Please verify the service directory exists and contains a docker-compose file.""",
-                    )
-                ]
+                )
+            ]
 
         # PHASE 1: Create pending scan operation
         if not approval_token:
-            return self._create_pending_scan(service, file_path)
+            return self._create_pending_scan(service, file_path, st)
 
         # PHASE 3: Execute scan with approval
-        return self._execute_scan(service, file_path, approval_token)
+        return self._execute_scan(service, file_path, approval_token, st)
 
-    def _create_pending_scan(self, service: str, file_path: str) -> Sequence[TextContent]:
+    def _create_pending_scan(
+        self, service: str, file_path: str, st: os.stat_result
+    ) -> Sequence[TextContent]:
         """Phase 1: Create pending scan operation."""
         try:
             # Validate file size
-            SecurityValidator.validate_file_size(file_path, max_size_mb=5)
+            SecurityValidator.validate_file_size_from_stat(st, max_size_mb=5)
 
             # Parse compose file
             compose_data = parse_docker_compose(file_path)
@@ -468,9 +636,7 @@ Please verify the service directory exists and contains a docker-compose file.""
             all_secrets = {}
             services_with_secrets = []
 
-            services = compose_data.get("services", {})
-            for svc_name, svc_config in services.items():
-                svc_secrets = extract_compose_secrets(compose_data, svc_name)
+            for svc_name, svc_secrets in iter_compose_secrets(compose_data):
                 if svc_secrets:
                     all_secrets.update(svc_secrets)
                     services_with_secrets.append(svc_name)
@@ -478,7 +644,7 @@ Please verify the service directory exists and contains a docker-compose file.""
             secret_count = len(all_secrets)
 
             # Create pending operation
-            approval_server = get_approval_server()
+            approval_server = _approval()
 
             op_id = approval_server.create_operation(
                 service=service,
@@ -491,6 +657,7 @@ Please verify the service directory exists and contains a docker-compose file.""
                     "services_with_secrets": services_with_secrets,
                 },
             )
+            _cache_parsed(op_id, file_path, st, compose_data)
 
             # Get approval URL
             approval_url = approval_server.get_approval_url(op_id)
@@ -499,32 +666,24 @@ Please verify the service directory exists and contains a docker-compose file.""
             self.audit_logger.log(
                 service=service,
                 action="SCAN_COMPOSE_REQUESTED",
-                details=("file={} potential_secrets={} containers={} op_id={}").format(
-                    file_path, secret_count, len(services_with_secrets), op_id
+                details=(
+                    f"file={file_path} potential_secrets={secret_count} "
+                    f"containers={len(services_with_secrets)} op_id={op_id}"
                 ),
             )
 
-            msg = (
-                "⚠️ SECURITY CHECKPOINT - SCAN APPROVAL REQUIRED\n\n"
-                "This operation will read secrets from:\n"
-                "  File: {}\n"
-                "  Detected: {} potential secret(s) in {} container(s)\n"
-                "  Containers: {}\n\n"
-                "The secrets will be tokenized (replaced with @token-xxx tokens).\n\n"
-                "To approve this scan:\n"
-                "  1. Open: {}\n"
-                "  2. Review scan details\n"
-                "  3. Authenticate with WebAuthn\n\n"
-                "After approval, call:\n"
-                '  vault_scan_compose(service="{}", approval_token="{}")'
-            ).format(
-                file_path,
-                secret_count,
-                len(services_with_secrets),
-                ", ".join(services_with_secrets) if services_with_secrets else "none",
-                approval_url,
-                service,
-                op_id,
+            msg = _COMPOSE_CHECKPOINT_TMPL.format_map(
+                {
+                    "file_path": file_path,
+                    "secret_count": secret_count,
+                    "container_count": len(services_with_secrets),
+                    "containers": (
+                        ", ".join(services_with_secrets) if services_with_secrets else "none"
+                    ),
+                    "approval_url": approval_url,
+                    "service": service,
+                    "op_id": op_id,
+                }
             )
             return [TextContent(type="text", text=msg)]
 
@@ -537,14 +696,21 @@ Please verify the service directory exists and contains a docker-compose file.""
             ]
 
     def _execute_scan(
-        self, service: str, file_path: str, approval_token: str
+        self, service: str, file_path: str, approval_token: str, st: os.stat_result
     ) -> Sequence[TextContent]:
         """Phase 3: Execute scan with approval."""
+        # A retry of an already completed scan gets the same response back
+        cache_key = (self.name, approval_token, service, file_path)
+        cached = _cached_scan_result(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             # Verify approval
-            approval_server = get_approval_server()
+            approval_server = _approval()
 
             if not approval_server.check_approval(approval_token):
+                _discard_parsed(approval_token)
                 return [
                     TextContent(
                         type="text",
@@ -555,106 +721,103 @@ Please verify the service directory exists and contains a docker-compose file.""
                     )
                 ]
 
-            # Parse compose file
-            compose_data = parse_docker_compose(file_path)
+            # Parse compose file (reusing the Phase-1 parse if unchanged)
+            compose_data = _load_parsed(approval_token, file_path, st, parse_docker_compose)
 
             # Get TokenVault
             vault = get_token_vault()
 
-            # Extract and tokenize secrets by container
-            secrets_by_container = {}
-
-            services = compose_data.get("services", {})
-            for svc_name, svc_config in services.items():
-                svc_secrets = extract_compose_secrets(compose_data, svc_name)
+            # Extract secrets and collect env_file references by container in a
+            # single walk over the services
+            keys_by_container: Dict[str, List[str]] = {}
+            pending = []
+            env_files: Dict[str, None] = {}  # Ordered set of env_file references
 
+            for svc_name, svc_secrets in iter_compose_secrets(compose_data):
                 if svc_secrets:
-                    # Tokenize secrets
-                    tokenized = {}
+                    keys_by_container[svc_name] = list(svc_secrets)
                     for key, value in svc_secrets.items():
-                        token = vault.tokenize(
-                            value,
-                            metadata={
-                                "service": service,
-                                "container": svc_name,
-                                "key": key,
-                                "source": "compose_scan",
-                                "file": file_path,
-                            },
-                        )
-                        tokenized[key] = token
-
-                    secrets_by_container[svc_name] = tokenized
-
-            # Get env_file references
-            env_files = []
-            for svc_name in services:
-                env_refs = get_env_file_references(compose_data, svc_name)
-                env_files.extend(env_refs)
-
-            env_files = list(set(env_files))  # Deduplicate
-
-            # Get compose version
+                        metadata = {
+                            "service": service,
+                            "container": svc_name,
+                            "key": key,
+                            "source": "compose_scan",
+                            "file": file_path,
+                        }
+                        pending.append((value, metadata))
+
+                env_files.update(dict.fromkeys(get_env_file_references(compose_data, svc_name)))
+
+            # Tokenize all containers' secrets in one batch, then split them
+            # back per container
+            tokens = iter(vault.tokenize_many(pending))
+            secrets_by_container = {
+                container: {key: next(tokens) for key in keys}
+                for container, keys in keys_by_container.items()
+            }
+
+            # Get compose version and container count
             compose_version = compose_data.get("version", "unknown")
+            container_count = len(compose_data.get("services", {}))
 
             # Count total secrets
             total_secrets = sum(len(s) for s in secrets_by_container.values())
 
-            # Audit log
+            # Audit log and migration state are both written in the background
             self.audit_logger.log(
                 service=service,
                 action="SCAN_COMPOSE_SUCCESS",
-                details="file={} secrets={} containers={}".format(
-                    file_path, total_secrets, len(secrets_by_container)
+                details=(
+                    f"file={file_path} secrets={total_secrets} "
+                    f"containers={len(secrets_by_container)}"
                 ),
             )
 
-            # Mark as scanned
-            from ..migration_state import mark_scanned
-
-            mark_scanned(service, [file_path], total_secrets)
+            _submit_io(mark_scanned, service, [file_path], total_secrets)
 
             # Cleanup approved operation
             approval_server.cleanup_operation(approval_token)
 
             # Format response
-            response_parts = [
-                "✅ Docker Compose scan completed!\n\n",
-                "**Service:** {}\n".format(service),
-                "**File:** {}\n".format(file_path),
-                "**Compose Version:** {}\n\n".format(compose_version),
-                "**Secrets Found (tokenized):**\n",
-            ]
+            buf = io.StringIO()
+            write = buf.write
+            write(
+                "✅ Docker Compose scan completed!\n\n"
+                f"**Service:** {service}\n"
+                f"**File:** {file_path}\n"
+                f"**Compose Version:** {compose_version}\n\n"
+                "**Secrets Found (tokenized):**\n"
+            )
 
             if secrets_by_container:
                 for container, secrets in secrets_by_container.items():
-                    response_parts.append("\n*Container: {}*\n".format(container))
+                    write(f"\n*Container: {container}*\n")
                     for key, token in secrets.items():
-                        response_parts.append("  • {}: {}\n".format(key, token))
+                        write(f"  • {key}: {token}\n")
             else:
-                response_parts.append("  No inline secrets detected\n")
+                write("  No inline secrets detected\n")
 
             if env_files:
-                response_parts.append("\n**env_file References:**\n")
+                write("\n**env_file References:**\n")
                 for ef in env_files:
-                    response_parts.append("  • {}\n".format(ef))
-                response_parts.append(
-                    "\nℹ️ Use vault_scan_env to scan these .env files " "separately.\n"
-                )
+                    write(f"  • {ef}\n")
+                write("\nℹ️ Use vault_scan_env to scan these .env files separately.\n")
 
-            response_parts.append(
+            write(
                 "\n**Summary:**\n"
-                "- Total containers: {}\n"
-                "- Secrets found: {}\n\n"
+                f"- Total containers: {container_count}\n"
+                f"- Secrets found: {total_secrets}\n\n"
                 "**Next Steps:**\n"
                 "1. If env_file references found, scan those files with "
                 "vault_scan_env\n"
                 "2. Use vault_set to store tokenized secrets to Vault\n"
                 "3. Consider updating compose file to use vault_inject "
-                "generated .env files".format(len(services), total_secrets)
+                "generated .env files"
             )
 
-            return [TextContent(type="text", text="".join(response_parts))]
+            result = [TextContent(type="text", text=buf.getvalue())]
+            _remember_scan_result(cache_key, result)
+            return result
 
         except Exception as e:
             self.audit_logger.log(service=service, action="SCAN_COMPOSE_FAILED", details=str(e))
@@ -1,18 +1,83 @@
 """Write tool: vault_set with security confirmation."""
 
+import io
 import json
 import os
-from typing import Sequence
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Sequence, Tuple
 
 from mcp.types import TextContent, Tool
 
-from ..approval_server import get_approval_server
+from ..approval_server import ApprovalServer, get_approval_server
 from ..security import AuditLogger, SecurityValidator, ValidationError
 from ..session import VaultSession
 from ..tokenization import get_token_vault
 from ..tools import ToolHandler
 from ..vault_client import VaultClient
 
+try:
+    import orjson
+except ImportError:  # orjson is in the optional speedups extra
+    orjson = None
+
+# Security mode is fixed for the life of the server process
+_SECURITY_MODE = os.getenv("VAULT_SECURITY_MODE", "tokenized")
+
+# Worker threads for Vault reads overlapped with input validation
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="vault-set")
+_PREFETCH_MIN_SECRETS = 2
+
+# Vault clients reused across calls so their HTTP sessions keep connections
+# alive: (vault_addr, token fingerprint) -> client
+_CLIENT_CACHE: Dict[Tuple[str, bytes], VaultClient] = {}
+_CLIENT_CACHE_MAX = 8
+
+
+def reload_security_mode() -> str:
+    """
+    Re-read VAULT_SECURITY_MODE from the environment.
+
+    Returns:
+        The security mode now in effect
+    """
+    global _SECURITY_MODE
+    _SECURITY_MODE = os.getenv("VAULT_SECURITY_MODE", "tokenized")
+    return _SECURITY_MODE
+
+
+def _get_client(session: VaultSession) -> VaultClient:
+    """Return the cached VaultClient for this session's address and token."""
+    key = (session.vault_addr, session.token_fingerprint)
+    client = _CLIENT_CACHE.get(key)
+    if client is None:
+        client = _CLIENT_CACHE[key] = VaultClient(session.vault_addr, session.vault_token)
+        # Evict the oldest clients (previous tokens) and close their connections
+        while len(_CLIENT_CACHE) > _CLIENT_CACHE_MAX:
+            _CLIENT_CACHE.pop(next(iter(_CLIENT_CACHE))).session.close()
+    return client
+
+
+def _dumps_preview(data: dict) -> str:
+    """Render secrets as indented JSON for the preview (orjson when installed)."""
+    if orjson is not None:  # pragma: no cover - depends on optional speedups extra
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+        except TypeError:
+            # Values orjson can't encode (e.g. ints beyond 64 bits) use the stdlib
+            pass
+    return json.dumps(data, indent=2)
+
+
+def _is_token(value: object) -> bool:
+    """
+    Check whether a secret value is a session token (@token-xxx).
+
+    Incoming values are known to be strings, but merged values read back from
+    Vault may not be, hence the type check.
+    """
+    return type(value) is str and value.startswith("@token-")
+
 
 class VaultSetTool(ToolHandler):
     """Tool for creating or updating secrets with security confirmation."""
@@ -20,6 +85,13 @@ class VaultSetTool(ToolHandler):
     def __init__(self):
         super().__init__("vault_set")
         self.audit_logger = AuditLogger()
+        self._approval_server: Optional[ApprovalServer] = None
+
+    def _approval(self) -> ApprovalServer:
+        """Return the approval server, looked up once per tool instance."""
+        if self._approval_server is None:
+            self._approval_server = get_approval_server()
+        return self._approval_server
 
     def get_tool_description(self) -> Tool:
         return Tool(
@@ -119,6 +191,20 @@ Claude Code MUST:
                 )
             ]
 
+        # Values are checked as strings once here, so the loops below can rely on it
+        if not all(type(value) is str for value in secrets.values()):
+            self.audit_logger.log("VALIDATION_FAILED", service, "Non-string secret value")
+            return [TextContent(type="text", text="❌ All secret values must be strings")]
+
+        # Look up the existing secret (CREATE vs UPDATE) while the values are
+        # validated; small batches validate too fast to be worth a thread
+        client = _get_client(session)
+        existing_future = (
+            _EXECUTOR.submit(client.get_secret, service)
+            if len(secrets) > _PREFETCH_MIN_SECRETS
+            else None
+        )
+
         # Validate all keys and values
         all_warnings = []
         try:
@@ -129,56 +215,62 @@ Claude Code MUST:
                 # Validate value constraints
                 SecurityValidator.validate_secret_value(value)
 
-                # Detect dangerous patterns
-                warnings = SecurityValidator.detect_dangerous_patterns(value)
-                if warnings:
-                    all_warnings.extend([f"{key}: {w}" for w in warnings])
+            # Detect dangerous patterns across all values at once
+            for key, warnings in SecurityValidator.detect_dangerous_patterns_batch(secrets).items():
+                all_warnings.extend([f"{key}: {w}" for w in warnings])
 
         except ValidationError as e:
             self.audit_logger.log("VALIDATION_FAILED", service, str(e))
             return [TextContent(type="text", text=f"❌ Validation failed: {e}")]
 
         # Check if service exists (to determine CREATE vs UPDATE)
-        client = VaultClient(session.vault_addr, session.vault_token)
-        existing_response = client.get_secret(service)
+        if existing_future is not None:
+            existing_response = existing_future.result()
+        else:
+            existing_response = client.get_secret(service)
         action = "UPDATE" if existing_response.success else "CREATE"
 
         # Merge with existing secrets if updating
         if action == "UPDATE":
             existing_secrets = existing_response.data["secrets"]
-            merged_secrets = {**existing_secrets, **secrets}
-            new_keys = set(secrets.keys()) - set(existing_secrets.keys())
-            updated_keys = set(secrets.keys()) & set(existing_secrets.keys())
+            # Partition the incoming keys in one pass over the keys view
+            existing_keys = existing_secrets.keys()
+            new_keys = [key for key in secrets if key not in existing_keys]
+            updated_keys = [key for key in secrets if key in existing_keys]
+            # existing_secrets was decoded for this call only, so merge in place
+            # (after partitioning, since the keys view is live)
+            existing_secrets.update(secrets)
+            merged_secrets = existing_secrets
         else:
             merged_secrets = secrets
-            new_keys = set(secrets.keys())
-            updated_keys = set()
+            new_keys = list(secrets)
+            updated_keys = []
 
-        # Show preview
-        preview_lines = [f"🔐 Preview: {action} secrets for service '{service}'", ""]
+        # Preview is only rendered on the branches that show it (dry run,
+        # approval request, write failure); the success path skips the JSON dump
+        def build_preview() -> str:
+            buf = io.StringIO()
+            buf.write(f"🔐 Preview: {action} secrets for service '{service}'\n\n")
 
-        if new_keys:
-            preview_lines.append(f"New keys ({len(new_keys)}):")
-            for key in new_keys:
-                preview_lines.append(f"  + {key}")
-            preview_lines.append("")
+            if new_keys:
+                buf.write(f"New keys ({len(new_keys)}):\n")
+                buf.write("".join(f"  + {key}\n" for key in new_keys))
+                buf.write("\n")
 
-        if updated_keys:
-            preview_lines.append(f"Updated keys ({len(updated_keys)}):")
-            for key in updated_keys:
-                preview_lines.append(f"  ~ {key}")
-            preview_lines.append("")
+            if updated_keys:
+                buf.write(f"Updated keys ({len(updated_keys)}):\n")
+                buf.write("".join(f"  ~ {key}\n" for key in updated_keys))
+                buf.write("\n")
 
-        if all_warnings:
-            preview_lines.append("⚠️  Security Warnings:")
-            for warning in all_warnings:
-                preview_lines.append(f"  - {warning}")
-            preview_lines.append("")
+            if all_warnings:
+                buf.write("⚠️  Security Warnings:\n")
+                buf.write("".join(f"  - {warning}\n" for warning in all_warnings))
+                buf.write("\n")
 
-        preview_lines.append("Data to write:")
-        preview_lines.append(f"```json\n{json.dumps(merged_secrets, indent=2)}\n```")
+            buf.write("Data to write:\n")
+            buf.write(f"```json\n{_dumps_preview(merged_secrets)}\n```")
 
-        preview_text = "\n".join(preview_lines)
+            return buf.getvalue()
 
         # Dry run mode - just show preview
         if dry_run:
@@ -186,7 +278,7 @@ Claude Code MUST:
             return [
                 TextContent(
                     type="text",
-                    text=f"""{preview_text}
+                    text=f"""{build_preview()}
 
 🔍 DRY RUN MODE - No changes made.
 
@@ -199,33 +291,30 @@ To actually write these secrets, call vault_set without dry_run=true.""",
             # Detokenize secrets for approval UI display
             # The approval UI is local-only, so it's safe to show real values
             # This allows users to verify what they're approving
-            detokenized_secrets = {}
-            tokens_map = {}  # Maps key -> token for display
+            # Maps key -> token for display
+            tokens_map = {key: value for key, value in merged_secrets.items() if _is_token(value)}
 
-            # Check if any values are tokens
-            has_tokens = any(
-                isinstance(v, str) and v.startswith("@token-") for v in merged_secrets.values()
-            )
-
-            if has_tokens:
+            if tokens_map:
                 token_vault = get_token_vault()
-                for key, value in merged_secrets.items():
-                    if isinstance(value, str) and value.startswith("@token-"):
-                        # Store the token for display
-                        tokens_map[key] = value
-                        # Detokenize the value
+                try:
+                    detokenized_secrets = token_vault.detokenize_dict(merged_secrets)
+                except ValueError:
+                    # Resolve token by token so one bad token doesn't hide the rest
+                    detokenized_secrets = dict(merged_secrets)
+                    for key, token in tokens_map.items():
                         try:
-                            detokenized_secrets[key] = token_vault.detokenize(value)
+                            detokenized_secrets[key] = token_vault.detokenize(token)
                         except Exception as e:
-                            print(f"[VaultSet] Warning: Failed to detokenize {key}: {e}")
-                            detokenized_secrets[key] = value  # Keep token if failed
-                    else:
-                        detokenized_secrets[key] = value
+                            print(
+                                f"[VaultSet] Warning: Failed to detokenize {key}: {e}",
+                                file=sys.stderr,
+                            )
+                            # Keep token if failed
             else:
                 detokenized_secrets = merged_secrets
 
             # Create pending operation and get approval server
-            approval_server = get_approval_server()
+            approval_server = self._approval()
             op_id, approval_url = approval_server.create_pending_operation(
                 service=service,
                 action=action,
@@ -243,7 +332,7 @@ To actually write these secrets, call vault_set without dry_run=true.""",
             return [
                 TextContent(
                     type="text",
-                    text=f"""{preview_text}
+                    text=f"""{build_preview()}
 
 ⚠️  SECURITY CHECKPOINT - WEBAUTHN APPROVAL REQUIRED
 
@@ -263,7 +352,7 @@ Operation expires in 5 minutes.""",
             ]
 
         # Check approval
-        approval_server = get_approval_server()
+        approval_server = self._approval()
 
         if not approval_server.is_approved(approval_token):
             msg = (
@@ -276,72 +365,75 @@ Operation expires in 5 minutes.""",
             return [TextContent(type="text", text=msg)]
 
         # User confirmed via WebAuthn - proceed with write
-        self.audit_logger.log(
-            "CONFIRMED",
-            service,
-            "User confirmed {} via WebAuthn, token={}".format(action, approval_token),
-        )
-
-        # Detokenize if in tokenized mode
-        security_mode = os.getenv("VAULT_SECURITY_MODE", "tokenized")
+        audit_events = [
+            (
+                "CONFIRMED",
+                service,
+                "User confirmed {} via WebAuthn, token={}".format(action, approval_token),
+            )
+        ]
+        try:
+            # Detokenize if in tokenized mode; plaintext values are written as-is
+            if _SECURITY_MODE == "tokenized" and any(_is_token(v) for v in merged_secrets.values()):
+                vault = get_token_vault()
+
+                # Detokenize all token values, counting them in the same pass
+                detokenized_secrets, token_count = vault.detokenize_dict_counted(merged_secrets)
+
+                if token_count > 0:
+                    audit_events.append(
+                        (
+                            "DETOKENIZATION",
+                            service,
+                            f"Detokenized {token_count} token(s) before writing to Vault",
+                        )
+                    )
+            else:
+                detokenized_secrets = merged_secrets
 
-        if security_mode == "tokenized":
-            vault = get_token_vault()
+            # Write detokenized secrets to Vault
+            write_response = client.write_secret(service, detokenized_secrets)
 
-            # Detokenize all token values
-            detokenized_secrets = vault.detokenize_dict(merged_secrets)
+            if not write_response.success:
+                audit_events.append(("FAILED", service, f"Write error: {write_response.error}"))
+                return [
+                    TextContent(
+                        type="text",
+                        text=f"""❌ Failed to write secrets: {write_response.error}
 
-            # Count how many were detokenized
-            token_count = sum(
-                1 for v in merged_secrets.values() if isinstance(v, str) and v.startswith("@token-")
-            )
+{build_preview()}""",
+                    )
+                ]
 
-            if token_count > 0:
-                self.audit_logger.log(
-                    "DETOKENIZATION",
-                    service,
-                    f"Detokenized {token_count} token(s) before writing to Vault",
-                )
-        else:
-            detokenized_secrets = merged_secrets
+            # Success! Clean up pending operation
+            approval_server.cleanup_operation(approval_token)
 
-        # Write detokenized secrets to Vault
-        write_response = client.write_secret(service, detokenized_secrets)
+            version = write_response.data.get("version", "N/A")
+            keys_written = ", ".join(secrets.keys())
+            audit_events.append(
+                ("SUCCESS", service, f"{action} version={version} keys={keys_written}")
+            )
+            keys_listing = "\n".join(f"  • {k}" for k in secrets)
 
-        if not write_response.success:
-            self.audit_logger.log("FAILED", service, f"Write error: {write_response.error}")
             return [
                 TextContent(
                     type="text",
-                    text=f"""❌ Failed to write secrets: {write_response.error}
-
-{preview_text}""",
-                )
-            ]
-
-        # Success! Clean up pending operation
-        approval_server.cleanup_operation(approval_token)
-
-        version = write_response.data.get("version", "N/A")
-        keys_written = ", ".join(secrets.keys())
-        self.audit_logger.log("SUCCESS", service, f"{action} version={version} keys={keys_written}")
-
-        return [
-            TextContent(
-                type="text",
-                text=f"""✅ Success!
+                    text=f"""✅ Success!
 
 Service: {service}
 Action: {action}
 Version: {version}
 
 Secrets registered:
-{chr(10).join(f'  • {k}' for k in secrets.keys())}
+{keys_listing}
 
 Next steps:
   1. List secrets: vault_list with service='{service}'
   2. Inject to .env: vault_inject with service='{service}'
 
 Audit log: Operation logged to .claude-vault-audit.log""",
-            )
-        ]
+                )
+            ]
+        finally:
+            # Post-approval events share one timestamp and reach the log together
+            self.audit_logger.log_many(audit_events)
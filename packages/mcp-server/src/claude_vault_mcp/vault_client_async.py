@@ -0,0 +1,102 @@
+"""Async HTTP client for fetching Vault secrets concurrently."""
+
+import httpx
+
+from .vault_client import VaultResponse
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on optional httpx[http2] extra
+    HTTP2_AVAILABLE = False
+
+
+class AsyncVaultClient:
+    """
+    Async client for reading HashiCorp Vault KV v2 secrets.
+
+    Reads for several services share one connection pool (multiplexed over a
+    single TLS connection when HTTP/2 is available), so N services cost about
+    one round-trip instead of N sequential ones.
+
+    Example:
+        async with AsyncVaultClient(addr, token) as client:
+            responses = await asyncio.gather(
+                client.get_secret("jellyfin"), client.get_secret("sonarr")
+            )
+    """
+
+    def __init__(self, vault_addr: str, vault_token: str):
+        """
+        Initialize async Vault client.
+
+        Args:
+            vault_addr: Vault server URL (e.g., https://vault.example.com)
+            vault_token: Vault authentication token
+        """
+        self.vault_addr = vault_addr.rstrip("/")
+        self.timeout = 10  # seconds
+        self.client = httpx.AsyncClient(
+            headers={"X-Vault-Token": vault_token, "Content-Type": "application/json"},
+            timeout=self.timeout,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=16),
+        )
+
+    async def __aenter__(self) -> "AsyncVaultClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self.client.aclose()
+
+    async def get_secret(self, service: str) -> VaultResponse:
+        """
+        Get secret data for a service.
+
+        Args:
+            service: Service name
+
+        Returns:
+            VaultResponse with secret data or error
+        """
+        url = f"{self.vault_addr}/v1/secret/data/proxmox-services/{service}"
+        try:
+            response = await self.client.get(url)
+
+            if response.status_code == 200:
+                data = response.json()
+                return VaultResponse(
+                    success=True,
+                    data={
+                        "secrets": data.get("data", {}).get("data", {}),
+                        "metadata": data.get("data", {}).get("metadata", {}),
+                    },
+                    http_code=200,
+                )
+            elif response.status_code == 404:
+                return VaultResponse(
+                    success=False, error=f"Service '{service}' not found in Vault", http_code=404
+                )
+            else:
+                return VaultResponse(
+                    success=False,
+                    error=f"HTTP {response.status_code}",
+                    http_code=response.status_code,
+                )
+
+        except httpx.ConnectError:
+            return VaultResponse(
+                success=False,
+                error=f"Cannot reach Vault at {self.vault_addr}. Check network connectivity.",
+            )
+        except httpx.TimeoutException:
+            return VaultResponse(
+                success=False, error="Vault request timed out. Server may be overloaded."
+            )
+        except Exception as e:
+            return VaultResponse(success=False, error=f"Error getting secret: {str(e)}")
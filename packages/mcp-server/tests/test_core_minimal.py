@@ -1,5 +1,6 @@
 """Minimal core tests - only testing what actually works."""
 
+import asyncio
 import pytest
 import sys
 import os
@@ -7,9 +8,25 @@ import os
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
 
+from claude_vault_mcp import approval_server as approval_module
+from claude_vault_mcp import session as session_module
+from claude_vault_mcp.session import VaultSession, get_session
 from claude_vault_mcp.tokenization import TokenVault
-from claude_vault_mcp.security import SecurityValidator
-from claude_vault_mcp.file_parsers import parse_env_file, parse_docker_compose, classify_secret
+from claude_vault_mcp.security import AuditLogger, SecurityValidator, ValidationError
+from mcp import types
+from mcp.types import TextContent
+from claude_vault_mcp.server import app
+from claude_vault_mcp.tools import scan as scan_module
+from claude_vault_mcp.vault_client import VaultResponse
+from claude_vault_mcp.vault_client_async import AsyncVaultClient
+from claude_vault_mcp.file_parsers import (
+    parse_env_file,
+    parse_env_file_stream,
+    parse_docker_compose,
+    classify_secret,
+    count_env_secrets,
+    may_be_secret,
+)
 
 
 class TestTokenizationCore:
@@ -46,6 +63,40 @@ class TestTokenizationCore:
 
         assert vault.detokenize(token) == special
 
+    def test_detokenize_dict_counted(self):
+        """Counted detokenization matches detokenize_dict and counts nested tokens."""
+        vault = TokenVault()
+        data = {
+            "API_KEY": vault.tokenize("key_value"),
+            "PLAIN": "not_a_token",
+            "NESTED": {"PASSWORD": vault.tokenize("pw_value")},
+            "LIST": [vault.tokenize("list_value"), "plain"],
+        }
+
+        result, count = vault.detokenize_dict_counted(data)
+
+        assert result == vault.detokenize_dict(data)
+        assert result["NESTED"]["PASSWORD"] == "pw_value"
+        assert count == 3
+
+    def test_tokenize_many(self):
+        """Batch tokenization matches tokenize() and deduplicates values."""
+        vault = TokenVault()
+        existing = vault.tokenize("already_tokenized_value")
+
+        tokens = vault.tokenize_many(
+            [
+                ("first_secret_value", {"key": "A"}),
+                ("already_tokenized_value", None),
+                ("first_secret_value", {"key": "B"}),
+            ]
+        )
+
+        assert tokens[0].startswith("@token-") and len(tokens[0]) == len(existing)
+        assert tokens[1] == existing
+        assert tokens[2] == tokens[0]
+        assert vault.detokenize(tokens[0]) == "first_secret_value"
+
 
 class TestSecurityCore:
     """Core security validation tests."""
@@ -68,6 +119,14 @@ class TestSecurityCore:
         validator.validate_key_name("db-password")
         validator.validate_key_name("KEY123")
 
+    def test_invalid_names_rejected_on_repeat_calls(self):
+        """Memoized validators still raise for invalid names every time."""
+        for _ in range(2):
+            with pytest.raises(ValidationError):
+                SecurityValidator.validate_service_name("../etc")
+            with pytest.raises(ValidationError):
+                SecurityValidator.validate_key_name("bad key")
+
     def test_detect_command_injection(self):
         """Command injection patterns detected."""
         validator = SecurityValidator()
@@ -96,6 +155,267 @@ class TestSecurityCore:
             patterns = validator.detect_dangerous_patterns(value)
             assert len(patterns) == 0, f"False positive: {value}"
 
+    def test_batch_detection_matches_per_value(self):
+        """Batch scan attributes matches to the right key, even at boundaries."""
+        values = {f"KEY_{i}": f"safe-value-{i}" for i in range(12)}
+        values.update(
+            {
+                "TRAILING": "ends with &",
+                "LEADING": "& starts with",
+                "INJECT": "$(whoami) && echo `id`",
+                "EMPTY": "",
+                "MULTI": "line1\nline2;",
+            }
+        )
+
+        expected = {}
+        for key, value in values.items():
+            patterns = SecurityValidator.detect_dangerous_patterns(value)
+            if patterns:
+                expected[key] = patterns
+
+        assert SecurityValidator.detect_dangerous_patterns_batch(values) == expected
+        assert list(expected) == ["INJECT", "MULTI"]
+
+    def test_audit_log_written_in_background(self, tmp_path):
+        """Entries are appended in order by the writer thread, owner-only."""
+        log_path = tmp_path / "audit.log"
+        logger = AuditLogger(str(log_path))
+
+        logger.log("CONFIRMED", "jellyfin", "first")
+        logger.log("SUCCESS", "jellyfin", "second")
+        assert logger.flush(timeout=5)
+
+        lines = log_path.read_text().splitlines()
+        assert [line.split("DETAILS=")[1] for line in lines] == ["first", "second"]
+        assert "ACTION=CONFIRMED SERVICE=jellyfin" in lines[0]
+        assert (log_path.stat().st_mode & 0o777) == 0o600
+
+
+class TestSessionCore:
+    """Core session tests."""
+
+    def test_token_fingerprint(self, mock_token):
+        """Fingerprint is stable per token and never contains the token."""
+        session = VaultSession("https://vault.example.com", mock_token, 0)
+        other = VaultSession("https://vault.example.com", mock_token + "x", 0)
+
+        assert len(session.token_fingerprint) == 16
+        assert session.token_fingerprint == VaultSession("", mock_token, 0).token_fingerprint
+        assert session.token_fingerprint != other.token_fingerprint
+        assert mock_token.encode() not in session.token_fingerprint
+
+    def test_get_session_reused_until_env_changes(self, monkeypatch, mock_token):
+        """Session object is shared across calls and rebuilt on env change."""
+        monkeypatch.setenv("VAULT_ADDR", "https://vault.example.com")
+        monkeypatch.setenv("VAULT_TOKEN", mock_token)
+        monkeypatch.delenv("VAULT_TOKEN_EXPIRY", raising=False)
+
+        session = get_session()
+        assert session is get_session()
+        cache_key = session_module._session_cache[0]
+        assert session.token_fingerprint in cache_key
+        assert mock_token not in cache_key
+
+        monkeypatch.setenv("VAULT_TOKEN", mock_token + "x")
+        assert get_session().vault_token == mock_token + "x"
+
+        monkeypatch.delenv("VAULT_TOKEN")
+        assert get_session() is None
+
+
+class TestApprovalExpiryCore:
+    """Pending approval operations expire from the TTL heap."""
+
+    def test_pending_operations_expire_in_order(self, monkeypatch, tmp_path):
+        """Soonest expiry goes first; cleaned-up and reloaded ops leave no trace."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        clock = [1000.0]
+
+        class FakeDatetime:
+            @staticmethod
+            def now():
+                return type("Now", (), {"timestamp": staticmethod(lambda: clock[0])})()
+
+        monkeypatch.setattr(approval_module, "datetime", FakeDatetime)
+        server = approval_module.ApprovalServer()
+
+        first = server.create_operation(service="svc", action="SCAN_ENV", secrets={})
+        clock[0] = 1100.0
+        second, _ = server.create_pending_operation(service="svc", action="CREATE", secrets={})
+        clock[0] = 1200.0
+        third = server.create_operation(service="svc", action="SCAN_ENV", secrets={})
+
+        # Executed operations leave a stale heap entry; reloads don't add entries
+        server.cleanup_operation(second)
+        server._load_pending_operations()
+        assert len(server._expiry_heap) == 3
+
+        clock[0] = 1350.0  # past first's expiry only
+        assert server._expire_pending_operations()
+        assert first not in server.pending_ops
+        assert list(server.pending_ops) == [third]
+
+        clock[0] = 1450.0  # second's stale entry is dropped without side effects
+        assert not server._expire_pending_operations()
+        assert list(server.pending_ops) == [third]
+        assert second in server.completed_ops
+
+        clock[0] = 1501.0
+        assert not server.is_approved(third)
+        assert not server.pending_ops
+        assert not server._expiry_heap
+
+
+class TestVaultGetAsyncCore:
+    """vault_get with a list of services, sent through the MCP request handlers."""
+
+    @staticmethod
+    def call_vault_get(arguments):
+        """Send tools/list then a vault_get tools/call, as an MCP client would."""
+
+        async def request():
+            list_request = types.ListToolsRequest(method="tools/list")
+            await app.request_handlers[types.ListToolsRequest](list_request)
+            call_request = types.CallToolRequest(
+                method="tools/call",
+                params=types.CallToolRequestParams(name="vault_get", arguments=arguments),
+            )
+            return await app.request_handlers[types.CallToolRequest](call_request)
+
+        return asyncio.run(request()).root
+
+    @pytest.fixture
+    def stub_vault(self, monkeypatch, mock_token):
+        """Stub Vault reads; later services answer first."""
+        monkeypatch.setenv("VAULT_ADDR", "https://vault.example.com")
+        monkeypatch.setenv("VAULT_TOKEN", mock_token)
+        monkeypatch.delenv("VAULT_TOKEN_EXPIRY", raising=False)
+        monkeypatch.setenv("VAULT_SECURITY_MODE", "plaintext")
+
+        stored = {
+            "alpha": {"TLS_KEY": "-----BEGIN KEY-----\nAAAA\n-----END KEY-----"},
+            "beta": {"PORT": "8080"},
+        }
+        delays = {"alpha": 0.03, "beta": 0.02, "missing": 0.0}
+        completed = []
+
+        async def get_secret(self, service):
+            await asyncio.sleep(delays[service])
+            completed.append(service)
+            if service not in stored:
+                return VaultResponse(
+                    success=False, error=f"Service '{service}' not found in Vault", http_code=404
+                )
+            return VaultResponse(
+                success=True, data={"secrets": stored[service], "metadata": {}}, http_code=200
+            )
+
+        monkeypatch.setattr(AsyncVaultClient, "get_secret", get_secret)
+        return completed
+
+    def test_results_follow_requested_order(self, stub_vault):
+        """Responses finishing out of order are rendered in request order."""
+        result = self.call_vault_get({"service": ["alpha", "missing", "beta"]})
+
+        # Reads ran concurrently and finished in reverse of the request order
+        assert stub_vault == ["missing", "beta", "alpha"]
+        assert not result.isError
+        content = result.content
+        assert len(content) == 3
+        assert "Secrets for service: alpha" in content[0].text
+        assert "  TLS_KEY: -----BEGIN KEY-----\nAAAA\n-----END KEY-----" in content[0].text
+        assert content[1].text == "❌ Service 'missing' not found in Vault"
+        assert "Secrets for service: beta" in content[2].text
+
+    def test_single_service_still_accepted(self, stub_vault, monkeypatch):
+        """A plain string service passes schema validation and takes the sync path."""
+        monkeypatch.setattr(
+            "claude_vault_mcp.tools.read.VaultGetTool.run_tool",
+            lambda self, arguments: [TextContent(type="text", text=arguments["service"])],
+        )
+
+        result = self.call_vault_get({"service": "alpha"})
+
+        assert not result.isError
+        assert result.content[0].text == "alpha"
+
+    def test_empty_service_list_rejected(self, stub_vault):
+        """An empty service list is rejected by the input schema."""
+        result = self.call_vault_get({"service": []})
+
+        assert result.isError
+        assert result.content[0].text.startswith("Input validation error:")
+
+
+class TestScanResultCacheCore:
+    """Phase-3 scan retries are served from the result cache, and only retries."""
+
+    @pytest.fixture
+    def scan_env(self, monkeypatch, tmp_path):
+        """Env scan tool with a stubbed approval server and a controllable clock."""
+        approved = {"op-1"}
+        cleaned = []
+
+        class FakeApprovalServer:
+            def check_approval(self, op_id):
+                return op_id in approved
+
+            def cleanup_operation(self, op_id):
+                cleaned.append(op_id)
+                approved.discard(op_id)
+
+        clock = [1000.0]
+        monkeypatch.setattr(scan_module, "_APPROVAL_SERVER", FakeApprovalServer())
+        monkeypatch.setattr(scan_module, "_SCAN_RESULT_CACHE", {})
+        monkeypatch.setattr(scan_module, "_submit_io", lambda *args: None)
+        monkeypatch.setattr(
+            scan_module, "time", type("Clock", (), {"monotonic": staticmethod(lambda: clock[0])})
+        )
+
+        env_file = tmp_path / ".env"
+        env_file.write_text("API_KEY=sk_live_abcdefghijklmnop1234\nPORT=8080\n")
+        other_file = tmp_path / "other.env"
+        other_file.write_text("API_KEY=sk_live_abcdefghijklmnop1234\n")
+
+        tool = scan_module.VaultScanEnvTool()
+        tool.audit_logger = AuditLogger(str(tmp_path / "audit.log"))
+        return tool, str(env_file), str(other_file), cleaned, clock
+
+    def test_retry_returns_same_tokens(self, scan_env):
+        """A retry with the same token and file returns the first response."""
+        tool, env_file, _, cleaned, _ = scan_env
+
+        first = tool._execute_scan("svc", env_file, "op-1")
+        second = tool._execute_scan("svc", env_file, "op-1")
+
+        assert "@token-" in first[0].text
+        assert second[0].text == first[0].text
+        assert cleaned == ["op-1"]
+
+    def test_other_token_or_file_misses_cache(self, scan_env):
+        """The cached response is bound to its approval token and file path."""
+        tool, env_file, other_file, cleaned, _ = scan_env
+        tool._execute_scan("svc", env_file, "op-1")
+
+        other_token = tool._execute_scan("svc", env_file, "op-2")
+        other_path = tool._execute_scan("svc", other_file, "op-1")
+
+        assert other_token[0].text.startswith("❌ Operation not approved")
+        assert other_path[0].text.startswith("❌ Operation not approved")
+        assert cleaned == ["op-1"]
+
+    def test_expired_result_not_served(self, scan_env):
+        """Past _SCAN_RESULT_TTL the retry goes back through check_approval."""
+        tool, env_file, _, cleaned, clock = scan_env
+        tool._execute_scan("svc", env_file, "op-1")
+
+        clock[0] += scan_module._SCAN_RESULT_TTL + 1
+        retry = tool._execute_scan("svc", env_file, "op-1")
+
+        assert retry[0].text.startswith("❌ Operation not approved")
+        assert cleaned == ["op-1"]
+
 
 class TestFileParsingCore:
     """Core file parsing tests."""
@@ -128,6 +448,31 @@ DB_PASS=value2
         assert secrets["API_KEY"] == "value1"
         assert secrets["DB_PASS"] == "value2"
 
+    def test_parse_env_file_stream(self, tmp_path):
+        """Stream yields pairs lazily and tolerates CRLF and bad bytes."""
+        env_file = tmp_path / ".env"
+        env_file.write_bytes(b'A=1\r\nCERT="line1\r\nline2"\r\nB=\xff\xfe\r\n')
+
+        pairs = list(parse_env_file_stream(str(env_file)))
+
+        assert pairs == [("A", "1"), ("CERT", "line1\nline2"), ("B", "\ufffd\ufffd")]
+        assert parse_env_file(str(env_file)) == dict(pairs)
+
+    def test_count_env_secrets(self, tmp_path):
+        """Counts match classifying the parsed dict; last assignment wins."""
+        env_file = tmp_path / ".env"
+        env_file.write_text("""API_KEY=sk_live_abcdefghijklmnop1234
+PORT=8080
+DB_PASSWORD=short
+DB_PASSWORD=SuperSecretPassword123!
+""")
+
+        parsed = parse_env_file(str(env_file))
+        expected = sum(classify_secret(k, v) for k, v in parsed.items())
+
+        assert count_env_secrets(str(env_file)) == (expected, len(parsed) - expected)
+        assert count_env_secrets(str(env_file)) == (2, 1)
+
     def test_parse_docker_compose(self, tmp_path):
         """Parse docker-compose.yml."""
         compose_file = tmp_path / "docker-compose.yml"
@@ -143,3 +488,19 @@ services:
 
         assert "services" in data
         assert "web" in data["services"]
+
+    def test_may_be_secret_prefilter(self):
+        """Prefilter only rejects values classify_secret would reject."""
+        samples = {
+            "API_KEY": "sk_live_abcdefghijklmnop1234",
+            "RANDOM": "Zx8kP2qL9mN4vB7w",
+            "PORT": "8080",
+            "EMPTY": "",
+            "FLAG": "true",
+        }
+
+        for key, value in samples.items():
+            if not may_be_secret(key, value):
+                assert not classify_secret(key, value), key
+        assert not may_be_secret("PORT", 8080)
+        assert may_be_secret("API_KEY", samples["API_KEY"])